@@ -37,6 +37,9 @@ class Settings(BaseSettings):
     ml_service_url: str = ""
     ml_window_secs: int = 30  # analysis window size (2-60, lower = more precise but slower)
 
+    # Batch analysis
+    batch_concurrency: int = 2  # videos analyzed in parallel (1-8)
+
     # Cagematch scraping
     scrape_rate_limit: float = 0.5  # requests per second
     scrape_burst: int = 3
@@ -59,7 +62,7 @@ settings = Settings()
 _runtime_overrides: dict = {}
 
 # Keys that can be changed via the admin settings UI
-CONFIGURABLE_KEYS = {"jellyfin_public_url", "admin_password", "scrape_rate_limit", "scrape_burst", "path_map_from", "path_map_to", "ml_path_map_to", "ml_audio_enabled", "ml_service_url", "ml_window_secs"}
+CONFIGURABLE_KEYS = {"jellyfin_public_url", "admin_password", "scrape_rate_limit", "scrape_burst", "path_map_from", "path_map_to", "ml_path_map_to", "ml_audio_enabled", "ml_service_url", "ml_window_secs", "batch_concurrency"}
 
 
 def _settings_path() -> Path:
@@ -10,7 +10,16 @@ from app.config import settings
 
 logger = logging.getLogger(__name__)
 
-engine = create_async_engine(settings.db_url, echo=False)
+# SQLite serializes writers on the one database file, so a large pool only turns
+# busy periods into "database is locked" errors and pool timeouts; a few
+# connections cover concurrent readers. In-memory SQLite (tests) uses a single
+# static connection that rejects pool sizing
+_pool_kwargs = (
+    {}
+    if settings.db_path == ":memory:"
+    else {"pool_size": 5, "max_overflow": 5, "pool_recycle": 3600}
+)
+engine = create_async_engine(settings.db_url, echo=False, pool_pre_ping=True, **_pool_kwargs)
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
@@ -1,6 +1,9 @@
+import atexit
 import logging
+import queue
 import sys
 from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
 from fastapi import Depends, FastAPI, Request
@@ -12,15 +15,27 @@ from app.config import load_runtime_settings, settings
 from app.database import init_db
 from app.dependencies import require_admin
 from app.routers import admin_auth, admin_settings, analysis, auth, browse, libraries, matching, player, search, sync, wrestlers
+from app.services.cagematch_scraper import close_scraper
 
-# Configure logging so all loggers output to stderr (visible in container logs)
+# Configure logging so all loggers output to stderr (visible in container logs).
+# Loggers only enqueue records; a listener thread does the stderr writes, so a
+# slow or blocked log pipe never stalls the event loop.
 # force=True overrides any pre-existing config from uvicorn
+_stderr_handler = logging.StreamHandler(sys.stderr)
+_stderr_handler.setFormatter(logging.Formatter("%(levelname)-5s [%(name)s] %(message)s"))
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_queue_handler = QueueHandler(_log_queue)
+# QueueHandler pre-renders the message (plus any traceback) before enqueueing;
+# keep that bare so the stderr formatter adds level/name exactly once
+_queue_handler.setFormatter(logging.Formatter("%(message)s"))
 logging.basicConfig(
     level=getattr(logging, settings.log_level.upper(), logging.INFO),
-    format="%(levelname)-5s [%(name)s] %(message)s",
-    stream=sys.stderr,
+    handlers=[_queue_handler],
     force=True,
 )
+_log_listener = QueueListener(_log_queue, _stderr_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 
 
 @asynccontextmanager
@@ -29,6 +44,7 @@ async def lifespan(app: FastAPI):
     await init_db()
     load_runtime_settings()
     yield
+    await close_scraper()
 
 
 app = FastAPI(
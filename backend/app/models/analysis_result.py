@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, Float, ForeignKey, Integer, String, Text, func
+from sqlalchemy import JSON, DateTime, Float, ForeignKey, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -20,9 +20,10 @@ class AnalysisResult(Base):
     total_steps: Mapped[int] = mapped_column(Integer, default=0)
     message: Mapped[str | None] = mapped_column(String, nullable=True)
     error: Mapped[str | None] = mapped_column(Text, nullable=True)
-    visual_detections: Mapped[str | None] = mapped_column(Text, nullable=True)
-    audio_detections: Mapped[str | None] = mapped_column(Text, nullable=True)
-    audio_spectrum: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Stored as JSON text; existing TEXT columns hold the same encoding
+    visual_detections: Mapped[list | None] = mapped_column(JSON(none_as_null=True), nullable=True)
+    audio_detections: Mapped[list | None] = mapped_column(JSON(none_as_null=True), nullable=True)
+    audio_spectrum: Mapped[dict | None] = mapped_column(JSON(none_as_null=True), nullable=True)
     audio_skip_reason: Mapped[str | None] = mapped_column(String, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
     completed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
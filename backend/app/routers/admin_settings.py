@@ -3,6 +3,7 @@ from pydantic import BaseModel
 
 from app.config import get_setting, save_runtime_settings
 from app.services.admin_session import invalidate_all_sessions
+from app.services.cagematch_scraper import reload_scraper_limits
 from app.services.ml_client import check_ml_available
 
 router = APIRouter()
@@ -19,6 +20,7 @@ class SettingsUpdate(BaseModel):
     ml_audio_enabled: bool | None = None
     ml_service_url: str | None = None
     ml_window_secs: int | None = None
+    batch_concurrency: int | None = None
 
 
 @router.get("/settings")
@@ -35,6 +37,7 @@ async def get_app_settings():
         "ml_audio_enabled": get_setting("ml_audio_enabled"),
         "ml_service_url": get_setting("ml_service_url"),
         "ml_window_secs": get_setting("ml_window_secs"),
+        "batch_concurrency": get_setting("batch_concurrency"),
     }
 
 
@@ -65,6 +68,8 @@ async def update_app_settings(body: SettingsUpdate):
         updates["ml_service_url"] = body.ml_service_url
     if body.ml_window_secs is not None:
         updates["ml_window_secs"] = max(2, min(body.ml_window_secs, 60))
+    if body.batch_concurrency is not None:
+        updates["batch_concurrency"] = max(1, min(body.batch_concurrency, 8))
 
     if updates:
         save_runtime_settings(updates)
@@ -72,6 +77,10 @@ async def update_app_settings(body: SettingsUpdate):
     if password_changed:
         invalidate_all_sessions()
 
+    # Shared scraper captured the old rate limits — update them in place
+    if "scrape_rate_limit" in updates or "scrape_burst" in updates:
+        await reload_scraper_limits()
+
     return {"success": True, "updated": list(updates.keys())}
 
 
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 import logging
 
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
@@ -88,11 +87,11 @@ async def get_analysis_results(
         raise HTTPException(status_code=404, detail="No completed analysis")
 
     # Parse audio spectrum (new field, NULL for old results)
-    spectrum_data = json.loads(analysis.audio_spectrum or "{}") if analysis.audio_spectrum else {}
+    spectrum_data = analysis.audio_spectrum or {}
 
     return {
-        "visual": json.loads(analysis.visual_detections or "[]"),
-        "audio": json.loads(analysis.audio_detections or "[]"),
+        "visual": analysis.visual_detections or [],
+        "audio": analysis.audio_detections or [],
         "audio_spectrum": spectrum_data.get("spectrum", []),
         "audio_window_secs": spectrum_data.get("window_secs", 30),
         "completed_at": analysis.completed_at.isoformat() if analysis.completed_at else None,
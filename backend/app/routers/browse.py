@@ -14,7 +14,7 @@ from app.models.video_item import VideoItem
 from app.models.wrestler import Wrestler
 from app.config import get_setting
 from app.routers.auth import _load_connection
-from app.services.cagematch_scraper import CagematchScraper
+from app.services.cagematch_scraper import get_scraper
 
 
 def _jellyfin_public_url() -> str:
@@ -224,7 +224,7 @@ async def scrape_event_matches(
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
-    scraper = CagematchScraper()
+    scraper = get_scraper()
     match_data_list = await scraper.scrape_event_matches(event.cagematch_event_id)
 
     if not match_data_list:
@@ -305,7 +305,7 @@ async def get_event_comments(
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
-    scraper = CagematchScraper()
+    scraper = get_scraper()
     comments = await scraper.scrape_event_comments(event.cagematch_event_id)
 
     return [
@@ -325,7 +325,7 @@ async def test_scrape(cagematch_event_id: int):
 
     Useful for testing the scraper against any event.
     """
-    scraper = CagematchScraper()
+    scraper = get_scraper()
 
     detail = await scraper.scrape_event_detail(cagematch_event_id)
     matches = await scraper.scrape_event_matches(cagematch_event_id)
@@ -10,7 +10,7 @@ from app.models.library import Library
 from app.models.promotion import Promotion
 from app.models.video_item import VideoItem
 from app.routers.browse import _jellyfin_public_url, _poster_url
-from app.services.cagematch_scraper import CagematchScraper
+from app.services.cagematch_scraper import get_scraper
 from app.services.matching_engine import (
     find_candidates,
     match_library,
@@ -65,7 +65,7 @@ async def _run_matching(library_id: int):
 
     _log(f"Matching started for library {library_id}")
 
-    scraper = CagematchScraper()
+    scraper = get_scraper()
     try:
         async with async_session() as db:
             stats = await match_library(db, library_id, scraper, on_progress=_on_progress)
@@ -179,7 +179,7 @@ async def get_video_candidates(
     if not promotion:
         raise HTTPException(status_code=404, detail="Promotion not found")
 
-    scraper = CagematchScraper()
+    scraper = get_scraper()
     candidates = await find_candidates(scraper, promotion.cagematch_id, video.extracted_date)
 
     title = video.title or video.filename or ""
@@ -273,7 +273,7 @@ async def rematch_video(
     video.match_confidence = None
     video.match_status = "unmatched"
 
-    scraper = CagematchScraper()
+    scraper = get_scraper()
     match_result = await match_video(
         db, video, scraper, promotion.cagematch_id, promotion.abbreviation or ""
     )
@@ -387,7 +387,7 @@ async def assign_match(
 
     if not db_event:
         # Scrape event detail to create it
-        scraper = CagematchScraper()
+        scraper = get_scraper()
         detail = await scraper.scrape_event_detail(cagematch_event_id)
         if not detail:
             raise HTTPException(status_code=404, detail="Event not found on Cagematch")
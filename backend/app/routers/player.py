@@ -1,11 +1,15 @@
+import time
 import uuid
+from urllib.parse import urlencode
 
-from fastapi import APIRouter, Depends, HTTPException
+import orjson
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 from fastapi.responses import Response
 from pydantic import BaseModel
-from sqlalchemy import func, select
+from sqlalchemy import func, lambda_stmt, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.config import get_setting
 from app.database import get_db
@@ -16,9 +20,14 @@ from app.models.match import Match, MatchParticipant
 from app.models.video_item import VideoItem
 from app.routers.auth import _load_connection, get_jellyfin_client
 from app.services.jellyfin_client import JellyfinClient
+from app.utils.json_response import OrjsonResponse
+from app.utils.response_cache import response_cache
 
 router = APIRouter()
 
+# Seconds the viewer-independent part of the player info is reused
+PLAYER_METADATA_TTL = 15
+
 
 # --- Pydantic schemas ---
 
@@ -72,11 +81,21 @@ async def _recompute_chapter_ends(db: AsyncSession, video_id: int):
         select(Chapter).where(Chapter.video_item_id == video_id).order_by(Chapter.start_ticks)
     )
     chapters = list(result.scalars().all())
-    for i, ch in enumerate(chapters):
-        if i + 1 < len(chapters):
-            ch.end_ticks = chapters[i + 1].start_ticks
-        else:
-            ch.end_ticks = video.duration_ticks if video else None
+    last_end = video.duration_ticks if video else None
+    next_starts = [ch.start_ticks for ch in chapters[1:]] + [last_end]
+    updates = []
+    for ch, end_ticks in zip(chapters, next_starts, strict=True):
+        if end_ticks != ch.end_ticks:
+            updates.append({"id": ch.id, "end_ticks": end_ticks})
+    if not updates:
+        return
+
+    # One executemany UPDATE instead of a per-chapter flush
+    await db.execute(update(Chapter), updates)
+    # Bulk UPDATE isn't guaranteed to refresh loaded objects — mirror the values without dirtying them
+    by_id = {ch.id: ch for ch in chapters}
+    for u in updates:
+        set_committed_value(by_id[u["id"]], "end_ticks", u["end_ticks"])
 
 
 async def _sync_chapters_to_jellyfin(db: AsyncSession, video_id: int, client: JellyfinClient):
@@ -98,70 +117,45 @@ async def _sync_chapters_to_jellyfin(db: AsyncSession, video_id: int, client: Je
         pass  # Non-fatal — local chapters still work
 
 
-# --- Player info endpoint ---
+def _build_direct_stream_url(
+    public_url: str, video: VideoItem, client: JellyfinClient, play_session_id: str
+) -> str:
+    """Build a Jellyfin static (direct play) stream URL with properly encoded query params."""
+    params = urlencode({
+        "static": "true",
+        "MediaSourceId": video.media_source_id,
+        "api_key": client.access_token,
+        "DeviceId": client.device_id,
+        "PlaySessionId": play_session_id,
+    })
+    return f"{public_url}/Videos/{video.jellyfin_item_id}/stream?{params}"
 
 
-@router.get("/{video_id}/info")
-async def get_player_info(
-    video_id: int,
-    db: AsyncSession = Depends(get_db),
-    client: JellyfinClient = Depends(get_jellyfin_client),
-):
-    """Main player info endpoint: stream URL, trickplay, chapters, event data."""
-    # Load video with eager-loaded chapters and matched_event
-    result = await db.execute(
-        select(VideoItem)
-        .options(selectinload(VideoItem.chapters), selectinload(VideoItem.matched_event))
-        .where(VideoItem.id == video_id)
-    )
-    video = result.scalar_one_or_none()
-    if not video:
-        raise HTTPException(status_code=404, detail="Video not found")
+def _player_metadata_key(video_id: int) -> str:
+    return f"{__name__}.player_metadata?video_id={video_id}"
 
-    # Public URL for client-facing URLs (stream, trickplay)
-    # Backend still uses client.server_url for API calls
-    jellyfin_public_url = get_setting("jellyfin_public_url")
-    public_url = jellyfin_public_url.rstrip("/") if jellyfin_public_url else client.server_url
 
-    # Ask Jellyfin for optimal playback method (direct play vs transcode)
-    play_session_id = str(uuid.uuid4())
-    playback_info = await client.get_playback_info(
-        video.jellyfin_item_id, video.media_source_id or video.jellyfin_item_id
-    )
-    play_session_id = playback_info.get("PlaySessionId", play_session_id)
+async def _get_player_metadata(db: AsyncSession, client: JellyfinClient, video: VideoItem) -> dict:
+    """Trickplay, chapters and event card for the player, cached briefly.
 
-    # Determine stream URL from Jellyfin's response
-    media_sources = playback_info.get("MediaSources", [])
-    stream_url = None
-    is_hls = False
-    if media_sources:
-        ms = media_sources[0]
-        transcode_url = ms.get("TranscodingUrl")
-        if ms.get("SupportsDirectPlay") or ms.get("SupportsDirectStream"):
-            # Direct play/stream — serve the file as-is or remuxed
-            stream_url = (
-                f"{public_url}/Videos/{video.jellyfin_item_id}/stream"
-                f"?static=true"
-                f"&MediaSourceId={video.media_source_id}"
-                f"&api_key={client.access_token}"
-                f"&DeviceId={client.device_id}"
-                f"&PlaySessionId={play_session_id}"
-            )
-        elif transcode_url:
-            # Jellyfin provides a transcoding URL (HLS)
-            stream_url = f"{public_url}{transcode_url}"
-            is_hls = True
+    Stream URLs carry the viewer's token and a fresh play session, so only this
+    viewer-independent part of the player info is shared between requests.
+    Entries are keyed per video and dropped when the matched event changes.
+    """
+    key = _player_metadata_key(video.id)
+    entry = response_cache.get(key)
+    if entry and entry.fresh_until > time.monotonic():
+        metadata = orjson.loads(entry.body)
+        if metadata["matched_event_id"] == video.matched_event_id:
+            return metadata
 
-    if not stream_url:
-        # Fallback: direct stream
-        stream_url = (
-            f"{public_url}/Videos/{video.jellyfin_item_id}/stream"
-            f"?static=true"
-            f"&MediaSourceId={video.media_source_id}"
-            f"&api_key={client.access_token}"
-            f"&DeviceId={client.device_id}"
-            f"&PlaySessionId={play_session_id}"
-        )
+    metadata = await _load_player_metadata(db, client, video)
+    response_cache.set(key, orjson.dumps(metadata), "application/json", PLAYER_METADATA_TTL)
+    return metadata
+
+
+async def _load_player_metadata(db: AsyncSession, client: JellyfinClient, video: VideoItem) -> dict:
+    video_id = video.id
 
     # Trickplay metadata (always check Jellyfin — DB flag may be stale)
     trickplay_data = None
@@ -227,7 +221,9 @@ async def get_player_info(
                 ],
             }
 
-    # Chapters (already ordered by start_ticks via relationship)
+    result = await db.execute(
+        select(Chapter).where(Chapter.video_item_id == video_id).order_by(Chapter.start_ticks)
+    )
     chapters = [
         {
             "id": c.id,
@@ -237,9 +233,64 @@ async def get_player_info(
             "start_ticks": c.start_ticks,
             "end_ticks": c.end_ticks,
         }
-        for c in video.chapters
+        for c in result.scalars()
     ]
 
+    return {
+        "matched_event_id": video.matched_event_id,
+        "trickplay": trickplay_data,
+        "chapters": chapters,
+        "event": event_data,
+    }
+
+
+# --- Player info endpoint ---
+
+
+@router.get("/{video_id}/info", response_class=OrjsonResponse)
+async def get_player_info(
+    video_id: int,
+    db: AsyncSession = Depends(get_db),
+    client: JellyfinClient = Depends(get_jellyfin_client),
+):
+    """Main player info endpoint: stream URL, trickplay, chapters, event data."""
+    video = await db.get(VideoItem, video_id)
+    if not video:
+        raise HTTPException(status_code=404, detail="Video not found")
+
+    # Public URL for client-facing URLs (stream, trickplay)
+    # Backend still uses client.server_url for API calls
+    jellyfin_public_url = get_setting("jellyfin_public_url")
+    public_url = jellyfin_public_url.rstrip("/") if jellyfin_public_url else client.server_url
+
+    # Ask Jellyfin for optimal playback method (direct play vs transcode)
+    play_session_id = str(uuid.uuid4())
+    playback_info = await client.get_playback_info(
+        video.jellyfin_item_id, video.media_source_id or video.jellyfin_item_id
+    )
+    play_session_id = playback_info.get("PlaySessionId", play_session_id)
+
+    # Determine stream URL from Jellyfin's response
+    media_sources = playback_info.get("MediaSources", [])
+    stream_url = None
+    is_hls = False
+    if media_sources:
+        ms = media_sources[0]
+        transcode_url = ms.get("TranscodingUrl")
+        if ms.get("SupportsDirectPlay") or ms.get("SupportsDirectStream"):
+            # Direct play/stream — serve the file as-is or remuxed
+            stream_url = _build_direct_stream_url(public_url, video, client, play_session_id)
+        elif transcode_url:
+            # Jellyfin provides a transcoding URL (HLS)
+            stream_url = f"{public_url}{transcode_url}"
+            is_hls = True
+
+    if not stream_url:
+        # Fallback: direct stream
+        stream_url = _build_direct_stream_url(public_url, video, client, play_session_id)
+
+    metadata = await _get_player_metadata(db, client, video)
+
     return {
         "video": {
             "id": video.id,
@@ -255,9 +306,9 @@ async def get_player_info(
             "api_key": client.access_token,
             "server_url": public_url,
         },
-        "trickplay": trickplay_data,
-        "chapters": chapters,
-        "event": event_data,
+        "trickplay": metadata["trickplay"],
+        "chapters": metadata["chapters"],
+        "event": metadata["event"],
     }
 
 
@@ -271,7 +322,7 @@ async def list_chapters(
 ):
     """List chapters for a video."""
     result = await db.execute(
-        select(Chapter).where(Chapter.video_item_id == video_id).order_by(Chapter.start_ticks)
+        lambda_stmt(lambda: select(Chapter).where(Chapter.video_item_id == video_id).order_by(Chapter.start_ticks))
     )
     chapters = result.scalars().all()
     return [
@@ -306,6 +357,7 @@ async def create_chapter(
     await _recompute_chapter_ends(db, video_id)
     await db.commit()
     await _sync_chapters_to_jellyfin(db, video_id, client)
+    response_cache.invalidate(_player_metadata_key(video_id))
     return {
         "id": chapter.id,
         "video_item_id": chapter.video_item_id,
@@ -337,6 +389,7 @@ async def update_chapter(
     await _recompute_chapter_ends(db, video_id)
     await db.commit()
     await _sync_chapters_to_jellyfin(db, video_id, client)
+    response_cache.invalidate(_player_metadata_key(video_id))
     return {
         "id": chapter.id,
         "video_item_id": chapter.video_item_id,
@@ -363,6 +416,7 @@ async def delete_chapter(
     await _recompute_chapter_ends(db, video_id)
     await db.commit()
     await _sync_chapters_to_jellyfin(db, video_id, client)
+    response_cache.invalidate(_player_metadata_key(video_id))
     return {"success": True}
 
 
@@ -373,13 +427,15 @@ async def delete_chapter(
 async def playback_start(
     video_id: int,
     report: PlaybackReport,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     client: JellyfinClient = Depends(get_jellyfin_client),
 ):
     video = await db.get(VideoItem, video_id)
     if not video:
         raise HTTPException(status_code=404, detail="Video not found")
-    await client.report_playback_start({
+    # Reported after the response is sent — the browser shouldn't wait on Jellyfin
+    background_tasks.add_task(client.report_playback_start, {
         "ItemId": video.jellyfin_item_id,
         "MediaSourceId": video.media_source_id,
         "PositionTicks": report.position_ticks,
@@ -393,13 +449,14 @@ async def playback_start(
 async def playback_progress(
     video_id: int,
     report: PlaybackReport,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     client: JellyfinClient = Depends(get_jellyfin_client),
 ):
     video = await db.get(VideoItem, video_id)
     if not video:
         raise HTTPException(status_code=404, detail="Video not found")
-    await client.report_playback_progress({
+    background_tasks.add_task(client.report_playback_progress, {
         "ItemId": video.jellyfin_item_id,
         "MediaSourceId": video.media_source_id,
         "PositionTicks": report.position_ticks,
@@ -413,13 +470,14 @@ async def playback_progress(
 async def playback_stopped(
     video_id: int,
     report: PlaybackReport,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     client: JellyfinClient = Depends(get_jellyfin_client),
 ):
     video = await db.get(VideoItem, video_id)
     if not video:
         raise HTTPException(status_code=404, detail="Video not found")
-    await client.report_playback_stopped({
+    background_tasks.add_task(client.report_playback_stopped, {
         "ItemId": video.jellyfin_item_id,
         "MediaSourceId": video.media_source_id,
         "PositionTicks": report.position_ticks,
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy import func, or_, select
+from sqlalchemy import func, lambda_stmt, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
@@ -15,12 +15,16 @@ async def global_search(
     q: str = Query(min_length=2),
     db: AsyncSession = Depends(get_db),
 ):
-    """Search events and wrestlers by name (local DB only)."""
+    """Search events and wrestlers by name (local DB only).
+
+    Queries are lambda statements so SQLAlchemy caches their compiled form
+    and only rebinds `pattern` per request.
+    """
     pattern = f"%{q}%"
 
     # Search events
-    event_result = await db.execute(
-        select(
+    event_result = await db.execute(lambda_stmt(
+        lambda: select(
             Event.id,
             Event.cagematch_event_id,
             Event.name,
@@ -32,7 +36,7 @@ async def global_search(
         .where(Event.name.ilike(pattern))
         .order_by(Event.date.desc())
         .limit(20)
-    )
+    ))
     events = [
         {
             "id": row.id,
@@ -47,8 +51,8 @@ async def global_search(
     ]
 
     # Search wrestlers with match count
-    wrestler_result = await db.execute(
-        select(
+    wrestler_result = await db.execute(lambda_stmt(
+        lambda: select(
             Wrestler.id,
             Wrestler.cagematch_wrestler_id,
             Wrestler.name,
@@ -61,7 +65,7 @@ async def global_search(
         .group_by(Wrestler.id)
         .order_by(func.count(MatchParticipant.id).desc())
         .limit(20)
-    )
+    ))
     wrestlers = [
         {
             "id": row.id,
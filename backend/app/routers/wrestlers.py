@@ -1,16 +1,18 @@
+import asyncio
 import logging
 from datetime import datetime, timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func, select
+from sqlalchemy import func, lambda_stmt, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.database import get_db
 from app.models.event import Event
 from app.models.match import Match, MatchParticipant
 from app.models.wrestler import Wrestler
-from app.services.cagematch_scraper import CagematchScraper
+from app.services.cagematch_scraper import get_scraper
+from app.utils.json_response import OrjsonResponse
+from app.utils.response_cache import cached_response
 
 logger = logging.getLogger(__name__)
 
@@ -18,27 +20,62 @@ router = APIRouter()
 
 STALE_THRESHOLD = timedelta(days=7)
 
+# Per-wrestler locks so concurrent page loads for a stale profile coalesce
+# into a single scrape. Entries are dropped once no request holds or awaits them.
+_scrape_locks: dict[int, asyncio.Lock] = {}
+_scrape_lock_users: dict[int, int] = {}
+
 
 async def _find_wrestler(db: AsyncSession, cagematch_id: int) -> Wrestler | None:
     """Look up a wrestler by cagematch_wrestler_id."""
     result = await db.execute(
-        select(Wrestler).where(Wrestler.cagematch_wrestler_id == cagematch_id)
+        lambda_stmt(lambda: select(Wrestler).where(Wrestler.cagematch_wrestler_id == cagematch_id))
     )
     return result.scalar_one_or_none()
 
 
+async def _count_matches(db: AsyncSession, wrestler_id: int) -> int:
+    result = await db.execute(
+        lambda_stmt(
+            lambda: select(func.count()).select_from(MatchParticipant).where(MatchParticipant.wrestler_id == wrestler_id)
+        )
+    )
+    return result.scalar() or 0
+
+
 async def _maybe_scrape_profile(wrestler: Wrestler, db: AsyncSession):
     """Lazy-scrape wrestler profile from Cagematch if linked and data is stale."""
-    if not wrestler.is_linked or not wrestler.cagematch_wrestler_id:
+    if not wrestler.is_linked or not wrestler.cagematch_wrestler_id or not _needs_scrape(wrestler):
         return
 
+    cagematch_id = wrestler.cagematch_wrestler_id
+    lock = _scrape_locks.setdefault(cagematch_id, asyncio.Lock())
+    _scrape_lock_users[cagematch_id] = _scrape_lock_users.get(cagematch_id, 0) + 1
+    try:
+        waited = lock.locked()
+        scraped_at = wrestler.last_scraped
+        async with lock:
+            if waited:
+                # Another request scraped while we waited — pick up its result
+                await db.refresh(wrestler)
+                if wrestler.last_scraped != scraped_at:
+                    return
+            await _scrape_profile(wrestler, db)
+    finally:
+        _scrape_lock_users[cagematch_id] -= 1
+        if not _scrape_lock_users[cagematch_id]:
+            del _scrape_lock_users[cagematch_id]
+            _scrape_locks.pop(cagematch_id, None)
+
+
+def _needs_scrape(wrestler: Wrestler) -> bool:
     is_stale = not wrestler.last_scraped or (datetime.now() - wrestler.last_scraped) >= STALE_THRESHOLD
-    missing_image = not wrestler.image_url
-    if not is_stale and not missing_image:
-        return
+    return is_stale or not wrestler.image_url
+
 
+async def _scrape_profile(wrestler: Wrestler, db: AsyncSession):
     try:
-        scraper = CagematchScraper()
+        scraper = get_scraper()
         profile = await scraper.scrape_wrestler_profile(wrestler.cagematch_wrestler_id)
         if profile:
             if profile.name:
@@ -65,6 +102,7 @@ async def _maybe_scrape_profile(wrestler: Wrestler, db: AsyncSession):
 
 
 @router.get("/{cagematch_id}")
+@cached_response(ttl=60)
 async def get_wrestler(cagematch_id: int, db: AsyncSession = Depends(get_db)):
     """Get wrestler profile by Cagematch ID. Lazy-scrapes if data is stale."""
     wrestler = await _find_wrestler(db, cagematch_id)
@@ -73,11 +111,7 @@ async def get_wrestler(cagematch_id: int, db: AsyncSession = Depends(get_db)):
 
     await _maybe_scrape_profile(wrestler, db)
 
-    # Count matches
-    match_count_result = await db.execute(
-        select(func.count()).select_from(MatchParticipant).where(MatchParticipant.wrestler_id == wrestler.id)
-    )
-    match_count = match_count_result.scalar() or 0
+    match_count = await _count_matches(db, wrestler.id)
 
     return {
         "id": wrestler.id,
@@ -102,7 +136,7 @@ async def get_wrestler(cagematch_id: int, db: AsyncSession = Depends(get_db)):
     }
 
 
-@router.get("/{cagematch_id}/matches")
+@router.get("/{cagematch_id}/matches", response_class=OrjsonResponse)
 async def get_wrestler_matches(
     cagematch_id: int,
     limit: int = Query(default=50, le=100),
@@ -116,66 +150,90 @@ async def get_wrestler_matches(
 
     wrestler_id = wrestler.id
 
-    # Total count
-    total_result = await db.execute(
-        select(func.count()).select_from(MatchParticipant).where(MatchParticipant.wrestler_id == wrestler_id)
-    )
-    total = total_result.scalar() or 0
-
-    # Fetch matches with eager loading
-    result = await db.execute(
-        select(MatchParticipant)
-        .options(
-            selectinload(MatchParticipant.match)
-            .selectinload(Match.event),
-            selectinload(MatchParticipant.match)
-            .selectinload(Match.participants)
-            .selectinload(MatchParticipant.wrestler),
+    total = await _count_matches(db, wrestler_id)
+
+    # Page of matches: plain column rows, no ORM hydration
+    result = await db.execute(lambda_stmt(
+        lambda: select(
+            Match.id,
+            Match.match_number,
+            Match.match_type,
+            Match.title_name,
+            Match.result,
+            Match.rating,
+            Match.votes,
+            Match.duration,
+            MatchParticipant.is_winner,
+            MatchParticipant.role,
+            Event.id.label("event_id"),
+            Event.cagematch_event_id,
+            Event.name.label("event_name"),
+            Event.date.label("event_date"),
+            Event.promotion_id,
         )
-        .where(MatchParticipant.wrestler_id == wrestler_id)
+        .select_from(MatchParticipant)
         .join(Match, MatchParticipant.match_id == Match.id)
         .join(Event, Match.event_id == Event.id)
+        .where(MatchParticipant.wrestler_id == wrestler_id)
         .order_by(Event.date.desc(), Match.match_number)
         .offset(offset)
         .limit(limit)
-    )
-    participations = result.scalars().unique().all()
-
-    matches = []
-    for mp in participations:
-        m = mp.match
-        ev = m.event
-        matches.append({
-            "match_id": m.id,
-            "match_number": m.match_number,
-            "match_type": m.match_type,
-            "title_name": m.title_name,
-            "result": m.result,
-            "rating": m.rating,
-            "votes": m.votes,
-            "duration": m.duration,
-            "is_winner": mp.is_winner,
-            "role": mp.role,
+    ))
+    rows = result.all()
+
+    # All participants of the page's matches in one query, grouped by match
+    participants_by_match: dict[int, list[dict]] = {row.id: [] for row in rows}
+    if participants_by_match:
+        p_result = await db.execute(
+            select(
+                MatchParticipant.match_id,
+                MatchParticipant.side,
+                MatchParticipant.team_name,
+                MatchParticipant.is_winner,
+                MatchParticipant.role,
+                Wrestler.id,
+                Wrestler.name,
+                Wrestler.cagematch_wrestler_id,
+                Wrestler.is_linked,
+            )
+            .join(Wrestler, MatchParticipant.wrestler_id == Wrestler.id)
+            .where(MatchParticipant.match_id.in_(participants_by_match))
+            .order_by(MatchParticipant.id)
+        )
+        for p in p_result.all():
+            participants_by_match[p.match_id].append({
+                "id": p.id,
+                "name": p.name,
+                "cagematch_wrestler_id": p.cagematch_wrestler_id,
+                "is_linked": p.is_linked,
+                "side": p.side,
+                "team_name": p.team_name,
+                "is_winner": p.is_winner,
+                "role": p.role,
+            })
+
+    matches = [
+        {
+            "match_id": row.id,
+            "match_number": row.match_number,
+            "match_type": row.match_type,
+            "title_name": row.title_name,
+            "result": row.result,
+            "rating": row.rating,
+            "votes": row.votes,
+            "duration": row.duration,
+            "is_winner": row.is_winner,
+            "role": row.role,
             "event": {
-                "id": ev.id,
-                "cagematch_event_id": ev.cagematch_event_id,
-                "name": ev.name,
-                "date": str(ev.date),
-                "promotion_id": ev.promotion_id,
+                "id": row.event_id,
+                "cagematch_event_id": row.cagematch_event_id,
+                "name": row.event_name,
+                "date": str(row.event_date),
+                "promotion_id": row.promotion_id,
             },
-            "participants": [
-                {
-                    "id": p.wrestler.id,
-                    "name": p.wrestler.name,
-                    "cagematch_wrestler_id": p.wrestler.cagematch_wrestler_id,
-                    "is_linked": p.wrestler.is_linked,
-                    "side": p.side,
-                    "team_name": p.team_name,
-                    "is_winner": p.is_winner,
-                    "role": p.role,
-                }
-                for p in m.participants
-            ],
-        })
+            "participants": participants_by_match[row.id],
+        }
+        for row in rows
+    ]
 
     return {"total": total, "matches": matches}
@@ -1,15 +1,18 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 import os
-import traceback
+import stat
+import time
+from dataclasses import dataclass, field
 from datetime import datetime
 
-from sqlalchemy import select
+from sqlalchemy import and_, func, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import get_setting
 from app.database import async_session
 from app.models.analysis_result import AnalysisResult
 from app.models.video_item import VideoItem
@@ -19,22 +22,133 @@ from app.services.scene_detector import detect_visual_transitions, detect_visual
 
 logger = logging.getLogger(__name__)
 
-# In-memory progress tracking keyed by video_item_id
-_analysis_progress: dict[int, dict] = {}
+
+@dataclass(slots=True)
+class PhaseProgress:
+    position: int = 0
+    total: int = 0
+    message: str = ""
+    # While set, the message is this template filled in from position/total on
+    # read, so per-tick callbacks don't format a string every second of media
+    template: str | None = None
+
+    def set_message(self, message: str) -> None:
+        self.message = message
+        self.template = None
+
+    def render(self) -> str:
+        if self.template:
+            return self.template.format(current=self.position, total=self.total)
+        return self.message
+
+
+@dataclass(slots=True)
+class ProgressState:
+    """Live progress for one video.
+
+    Progress callbacks fire every second of media, so they only store plain
+    attributes; the status dict the API returns is built on demand by snapshot().
+    """
+
+    status: str
+    message: str = ""
+    audio_skip_reason: str | None = None
+    phases: dict[str, PhaseProgress] = field(default_factory=dict)
+    analysis_id: int | None = None
+    last_flush: float = 0.0
+
+    def phase(self, name: str) -> PhaseProgress:
+        if name not in self.phases:
+            self.phases[name] = PhaseProgress()
+        return self.phases[name]
+
+    def snapshot(self) -> dict:
+        phases = list(self.phases.values())
+        running = self.status.startswith("running") and phases
+        snap = {
+            "status": self.status,
+            # Phases run concurrently, so the bar shows their combined progress
+            "progress": sum(p.position for p in phases),
+            "total_steps": sum(p.total for p in phases),
+            "message": " | ".join(p.render() for p in phases) if running else self.message,
+            "audio_skip_reason": self.audio_skip_reason,
+        }
+        for name, p in self.phases.items():
+            snap[f"{name}_progress"] = {
+                "progress": p.position,
+                "total_steps": p.total,
+                "message": p.render(),
+            }
+        return snap
+
+
+# In-memory progress tracking keyed by video_item_id. Both registries are only
+# touched from coroutines on the event loop, so plain dicts need no locking.
+# They are per-process: the app runs a single uvicorn worker, and anything
+# outside it sees the progress flushed to analysis_results every
+# PROGRESS_FLUSH_SECONDS through the status endpoint's DB fallback.
+_analysis_progress: dict[int, ProgressState] = {}
 
 # In-memory batch progress tracking keyed by library_id
 _batch_progress: dict[int, dict] = {}
 
+VISUAL_PROGRESS_TEMPLATE = "Analyzing video frames ({current}/{total}s)..."
+AUDIO_PROGRESS_TEMPLATE = "Analyzing audio ({current}/{total}s)..."
+
 # Overall timeout for a single video analysis
 ANALYSIS_TIMEOUT_SECONDS = 600  # 10 minutes
 
+# Minimum gap between progress writes to the analysis_results row
+PROGRESS_FLUSH_SECONDS = 5
+
+# Strong refs to in-flight progress flushes so they aren't garbage collected
+_flush_tasks: set[asyncio.Task] = set()
+
+# Finished entries stay visible this long so the UI's last poll sees the final status
+ANALYSIS_RESULT_TTL_SECONDS = 5
+BATCH_RESULT_TTL_SECONDS = 10
+SWEEP_INTERVAL_SECONDS = 10
+
+# monotonic() deadlines for finished entries, keyed like the registries above
+_analysis_expiry: dict[int, float] = {}
+_batch_expiry: dict[int, float] = {}
+_sweeper_task: asyncio.Task | None = None
+
+
+def _expire_later(expiry: dict[int, float], key: int, ttl: float) -> None:
+    global _sweeper_task
+    expiry[key] = time.monotonic() + ttl
+    if _sweeper_task is None or _sweeper_task.done():
+        _sweeper_task = asyncio.create_task(_sweep_expired())
+
+
+def _get_live(registry: dict, expiry: dict[int, float], key: int):
+    deadline = expiry.get(key)
+    if deadline is not None and deadline <= time.monotonic():
+        registry.pop(key, None)
+        expiry.pop(key, None)
+        return None
+    return registry.get(key)
+
+
+async def _sweep_expired() -> None:
+    """Drop finished entries nobody polled; exits once nothing is waiting to expire."""
+    while _analysis_expiry or _batch_expiry:
+        await asyncio.sleep(SWEEP_INTERVAL_SECONDS)
+        now = time.monotonic()
+        for registry, expiry in ((_analysis_progress, _analysis_expiry), (_batch_progress, _batch_expiry)):
+            for key in [k for k, deadline in expiry.items() if deadline <= now]:
+                registry.pop(key, None)
+                del expiry[key]
+
 
 def get_analysis_progress(video_id: int) -> dict | None:
-    return _analysis_progress.get(video_id)
+    state = _get_live(_analysis_progress, _analysis_expiry, video_id)
+    return state.snapshot() if state else None
 
 
 def get_batch_progress(library_id: int) -> dict | None:
-    return _batch_progress.get(library_id)
+    return _get_live(_batch_progress, _batch_expiry, library_id)
 
 
 async def run_analysis(
@@ -47,12 +161,11 @@ async def run_analysis(
     2. Resolve local file path and run audio pattern detection (if phase != "visual")
     3. Persist results to DB
     """
-    _analysis_progress[video_id] = {
-        "status": "running_visual" if phase != "audio" else "running_audio",
-        "progress": 0,
-        "total_steps": 0,
-        "message": f"Starting {'visual' if phase != 'audio' else 'audio'} analysis...",
-    }
+    _analysis_expiry.pop(video_id, None)
+    _analysis_progress[video_id] = ProgressState(
+        status="running_visual" if phase != "audio" else "running_audio",
+        message=f"Starting {'visual' if phase != 'audio' else 'audio'} analysis...",
+    )
 
     try:
         await asyncio.wait_for(
@@ -60,12 +173,10 @@ async def run_analysis(
             timeout=ANALYSIS_TIMEOUT_SECONDS,
         )
     except asyncio.TimeoutError:
-        logger.error(f"Analysis timed out for video {video_id}")
-        traceback.print_exc()
-        _analysis_progress[video_id].update({
-            "status": "failed",
-            "message": "Analysis timed out (10 minute limit)",
-        })
+        logger.exception("Analysis timed out for video %s", video_id)
+        state = _analysis_progress[video_id]
+        state.status = "failed"
+        state.message = "Analysis timed out (10 minute limit)"
         try:
             async with async_session() as db:
                 ar_result = await db.execute(
@@ -79,12 +190,10 @@ async def run_analysis(
         except Exception:
             pass
     except Exception as e:
-        logger.error(f"Analysis failed for video {video_id}: {e}")
-        traceback.print_exc()
-        _analysis_progress[video_id].update({
-            "status": "failed",
-            "message": f"Analysis failed: {e}",
-        })
+        logger.exception("Analysis failed for video %s: %s", video_id, e)
+        state = _analysis_progress[video_id]
+        state.status = "failed"
+        state.message = f"Analysis failed: {e}"
         try:
             async with async_session() as db:
                 ar_result = await db.execute(
@@ -98,14 +207,24 @@ async def run_analysis(
         except Exception:
             pass
     finally:
-        await asyncio.sleep(5)
-        _analysis_progress.pop(video_id, None)
+        _expire_later(_analysis_expiry, video_id, ANALYSIS_RESULT_TTL_SECONDS)
 
 
 async def _run_analysis_pipeline(
-    video_id: int, client: JellyfinClient, phase: str
+    video_id: int, client: JellyfinClient, phase: str, item_detail: dict | None = None
 ) -> None:
-    """Inner pipeline that does the actual analysis work."""
+    """Inner pipeline that does the actual analysis work.
+
+    item_detail: Jellyfin item detail prefetched by a batch run, used by the
+    trickplay fallback instead of fetching it again.
+    """
+    # Batch runs call straight in here without going through run_analysis
+    state = _analysis_progress.get(video_id)
+    if state is None:
+        state = _analysis_progress[video_id] = ProgressState(
+            status="running_visual" if phase != "audio" else "running_audio",
+        )
+
     async with async_session() as db:
         # Load video
         result = await db.execute(
@@ -115,214 +234,301 @@ async def _run_analysis_pipeline(
         if not video:
             raise ValueError(f"Video {video_id} not found")
 
-        # Create or update analysis result row
-        ar_result = await db.execute(
-            select(AnalysisResult).where(AnalysisResult.video_item_id == video_id)
-        )
-        analysis = ar_result.scalar_one_or_none()
-
-        if analysis:
-            status = "running_visual" if phase != "audio" else "running_audio"
-            analysis.status = status
-            analysis.progress = 0
-            analysis.total_steps = 0
-            analysis.message = f"Starting {phase} analysis..."
-            analysis.error = None
-            # Only clear detections for the phase being re-run
-            if phase in ("both", "visual"):
-                analysis.visual_detections = None
-            if phase in ("both", "audio"):
-                analysis.audio_detections = None
-                analysis.audio_spectrum = None
-                analysis.audio_skip_reason = None
-            analysis.completed_at = None
-        else:
-            analysis = AnalysisResult(
-                video_item_id=video_id,
-                status="running_visual" if phase != "audio" else "running_audio",
+        # Create or reset the analysis result row in one statement
+        fields = {
+            "status": "running_visual" if phase != "audio" else "running_audio",
+            "progress": 0,
+            "total_steps": 0,
+            "message": f"Starting {phase} analysis...",
+            "error": None,
+            "completed_at": None,
+        }
+        # Only clear detections for the phase being re-run
+        cleared = {}
+        if phase in ("both", "visual"):
+            cleared["visual_detections"] = None
+        if phase in ("both", "audio"):
+            cleared.update(audio_detections=None, audio_spectrum=None, audio_skip_reason=None)
+
+        stmt = (
+            sqlite_insert(AnalysisResult)
+            .values(video_item_id=video_id, **fields)
+            .on_conflict_do_update(index_elements=["video_item_id"], set_={**fields, **cleared})
+            .returning(
+                AnalysisResult.id,
+                # What a phase that isn't re-run keeps, for the completion summary
+                func.json_array_length(AnalysisResult.visual_detections).label("visual_count"),
+                func.json_array_length(AnalysisResult.audio_detections).label("audio_count"),
+                AnalysisResult.audio_skip_reason,
             )
-            db.add(analysis)
+        )
+        claimed = (await db.execute(stmt)).one()
+        state.analysis_id = claimed.id
         await db.commit()
 
-        # --- Resolve local file path (shared by visual + audio) ---
-        from app.config import get_setting
-        local_path = None
-        path_from = get_setting("path_map_from")
-        path_to = get_setting("path_map_to")
-        if video.path:
-            print(f"[ANALYSIS] Path mapping: from={path_from!r} to={path_to!r} video.path={video.path!r}", flush=True)
-            if path_from and path_to and video.path.startswith(path_from):
-                relative = video.path[len(path_from):].lstrip("/")
-                local_path = os.path.join(path_to, relative)
-                if not os.path.isfile(local_path):
-                    print(f"[ANALYSIS] Local file NOT found: {local_path}", flush=True)
-                    local_path = None
-                else:
-                    print(f"[ANALYSIS] Local file found: {local_path}", flush=True)
-        else:
-            print(f"[ANALYSIS] Video has no path set", flush=True)
-
-        # --- Visual scene detection ---
-        visual_detections: list[dict] = []
-        if phase in ("both", "visual"):
-            try:
-                def on_visual_progress(current: int, total: int):
-                    _analysis_progress[video_id].update({
-                        "progress": current,
-                        "total_steps": total,
-                        "message": f"Analyzing video frames ({current}/{total}s)...",
-                    })
-
-                if local_path:
-                    # Primary: ffmpeg frame extraction (0.5fps, much more accurate)
-                    logger.info(f"Visual detection via ffmpeg: {local_path}")
-                    visual_detections = await detect_visual_transitions(
-                        local_path,
-                        video.duration_ticks or 0,
-                        on_progress=on_visual_progress,
-                    )
-                else:
-                    # Fallback: trickplay thumbnails (less accurate, 10s intervals)
-                    logger.info(f"Visual detection via trickplay (no local path)")
-                    detail = await client.get_item_detail(video.jellyfin_item_id)
-                    tp = detail.get("Trickplay", {})
-                    trickplay_meta = None
-                    for media_id, resolutions in tp.items():
-                        for res_str, meta in resolutions.items():
-                            trickplay_meta = {
-                                "resolution": int(res_str),
-                                "width": meta["Width"],
-                                "height": meta["Height"],
-                                "tile_width": meta["TileWidth"],
-                                "tile_height": meta["TileHeight"],
-                                "thumbnail_count": meta["ThumbnailCount"],
-                                "interval": meta["Interval"],
-                            }
-                            break
-                        break
-
-                    if trickplay_meta:
-                        visual_detections = await detect_visual_transitions_trickplay(
-                            client, video.jellyfin_item_id, trickplay_meta,
-                            on_progress=on_visual_progress,
-                        )
-                    else:
-                        logger.info(f"Video {video_id} has no trickplay data, skipping visual detection")
-            except Exception as e:
-                logger.error(f"Visual detection failed: {e}")
-                traceback.print_exc()
-                _analysis_progress[video_id]["message"] = f"Visual detection failed: {e}"
+    # Both phases map from the Jellyfin path prefix; only visual needs the local file
+    path_from = get_setting("path_map_from")
+
+    # --- Visual + audio detection (independent, so run concurrently) ---
+    # Each phase saves its own results as soon as it finishes
+    phases = []
+    if phase in ("both", "visual"):
+        phases.append(_save_phase(state, _do_visual(video_id, state, video, client, path_from, item_detail)))
+    if phase in ("both", "audio"):
+        phases.append(_save_phase(state, _do_audio(video_id, state, video, path_from)))
+    results = await asyncio.gather(*phases, return_exceptions=True)
+
+    fields: dict = {}
+    for res in results:
+        if isinstance(res, BaseException):
+            raise res
+        fields.update(res)
+
+    # Build summary message from the detections still in memory; a phase that
+    # wasn't re-run keeps what the claim above returned
+    vis_count = (
+        len(fields["visual_detections"]) if "visual_detections" in fields else claimed.visual_count or 0
+    )
+    if "audio_detections" in fields:
+        aud_count = len(fields["audio_detections"])
+        skip_reason = fields["audio_skip_reason"]
+    else:
+        aud_count = claimed.audio_count or 0
+        skip_reason = claimed.audio_skip_reason
+    skip_note = f" (skipped: {skip_reason.split(':')[0]})" if skip_reason else ""
+    message = f"Done: {vis_count} visual, {aud_count} audio detections{skip_note}"
+
+    # Mark completed in a fresh session; none is held open while detecting
+    async with async_session() as db:
+        result = await db.execute(
+            update(AnalysisResult)
+            .where(AnalysisResult.id == state.analysis_id)
+            .values(status="completed", completed_at=datetime.now(), message=message, error=None)
+        )
+        await db.commit()
+    if result.rowcount == 0:
+        raise ValueError(f"Analysis result for video {video_id} was deleted during the run")
+
+    state.status = "completed"
+    state.message = message
+    state.audio_skip_reason = skip_reason
+
+
+async def _resolve_local_path(
+    video_id: int, video: VideoItem, path_from: str | None
+) -> str | None:
+    """Map the video's Jellyfin path onto the backend's mount, if the file is there."""
+    if not video.path:
+        logger.debug("Video %s has no path set", video_id)
+        return None
+    path_to = get_setting("path_map_to")
+    logger.debug("Path mapping: from=%r to=%r video.path=%r", path_from, path_to, video.path)
+    local_path = _map_path(video.path, path_from, path_to)
+    if not local_path:
+        return None
+    # Off the event loop: a stat on an NFS/SMB mount can block for a while
+    if not await asyncio.to_thread(_is_file, local_path):
+        logger.warning("Local file not found: %s", local_path)
+        return None
+    logger.debug("Local file found: %s", local_path)
+    return local_path
+
+
+async def _save_phase(state: ProgressState, phase_coro) -> dict:
+    """Await one detection phase and write its result fields in a short session."""
+    fields = await phase_coro
+    async with async_session() as db:
+        await db.execute(
+            update(AnalysisResult).where(AnalysisResult.id == state.analysis_id).values(**fields)
+        )
+        await db.commit()
+    return fields
 
-            # Save visual results
-            analysis.visual_detections = json.dumps(visual_detections)
 
-        # --- Audio detection (ML-powered, opt-in) ---
-        if phase in ("both", "audio"):
-            analysis.status = "running_audio"
-            analysis.progress = 0
-            analysis.total_steps = 0
-            analysis.message = "Starting audio analysis..."
-            await db.commit()
+def _map_path(path: str | None, prefix_from: str | None, prefix_to: str | None) -> str | None:
+    """Map a Jellyfin file path onto another mount by swapping its prefix."""
+    if not path or not prefix_from or not prefix_to or not path.startswith(prefix_from):
+        return None
+    relative = path[len(prefix_from):].lstrip("/")
+    return os.path.join(prefix_to, relative)
 
-            _analysis_progress[video_id].update({
-                "status": "running_audio",
-                "progress": 0,
-                "total_steps": 0,
-                "message": "Starting audio analysis...",
-            })
 
-            audio_detections: list[dict] = []
-            audio_spectrum: list[dict] = []
-            audio_window_secs: int = 30
-            audio_skip_reason: str | None = None
-
-            ml_enabled = get_setting("ml_audio_enabled")
-
-            # Resolve ML-local file path (separate from backend's local_path)
-            ml_path = None
-            if video.path:
-                ml_path_to = get_setting("ml_path_map_to")
-                if path_from and ml_path_to and video.path.startswith(path_from):
-                    relative = video.path[len(path_from):].lstrip("/")
-                    ml_path = os.path.join(ml_path_to, relative)
-                    print(f"[ANALYSIS] ML path resolved: {ml_path}", flush=True)
-
-            if not ml_enabled:
-                audio_skip_reason = "ml_audio_disabled"
-                logger.info(f"ML audio disabled, skipping audio for video {video_id}")
-                _analysis_progress[video_id]["message"] = (
-                    "Audio analysis skipped (ML audio not enabled)"
+def _is_file(path: str) -> bool:
+    """Single stat() that tells a regular file apart from a missing path or a directory."""
+    try:
+        return stat.S_ISREG(os.stat(path).st_mode)
+    except (OSError, ValueError):
+        return False
+
+
+def _maybe_flush_progress(state: ProgressState) -> None:
+    """Persist live progress to the DB, at most once every PROGRESS_FLUSH_SECONDS."""
+    now = time.monotonic()
+    if state.analysis_id is None or now - state.last_flush < PROGRESS_FLUSH_SECONDS:
+        return
+    state.last_flush = now
+    snap = state.snapshot()
+    task = asyncio.create_task(_flush_progress(
+        state.analysis_id, snap["progress"], snap["total_steps"], snap["message"],
+    ))
+    _flush_tasks.add(task)
+    task.add_done_callback(_flush_tasks.discard)
+
+
+async def _flush_progress(
+    analysis_id: int, progress: int, total_steps: int, message: str | None
+) -> None:
+    try:
+        async with async_session() as db:
+            await db.execute(
+                update(AnalysisResult)
+                # A late flush must not overwrite the final completed/failed row
+                .where(AnalysisResult.id == analysis_id, AnalysisResult.status.like("running%"))
+                .values(
+                    progress=progress,
+                    total_steps=total_steps,
+                    message=func.coalesce(message, AnalysisResult.message),
                 )
-            elif not ml_path:
-                audio_skip_reason = "no_ml_path_mapping"
-                logger.info(f"No ML path mapping for video {video_id}, skipping audio")
-                _analysis_progress[video_id]["message"] = (
-                    "Audio analysis skipped (ML path mapping not configured)"
+            )
+            await db.commit()
+    except Exception as e:
+        logger.warning("Failed to persist progress for analysis %s: %s", analysis_id, e)
+
+
+async def _do_visual(
+    video_id: int,
+    state: ProgressState,
+    video: VideoItem,
+    client: JellyfinClient,
+    path_from: str | None,
+    item_detail: dict | None = None,
+) -> dict:
+    """Visual scene detection. Returns the AnalysisResult fields to set."""
+    visual_detections: list[dict] = []
+    progress = state.phase("visual")
+    progress.set_message("Starting visual analysis...")
+    try:
+        local_path = await _resolve_local_path(video_id, video, path_from)
+
+        def on_visual_progress(current: int, total: int):
+            progress.position = current
+            progress.total = total
+            progress.template = VISUAL_PROGRESS_TEMPLATE
+            _maybe_flush_progress(state)
+
+        if local_path:
+            # Primary: ffmpeg frame extraction (0.5fps, much more accurate)
+            logger.info("Visual detection via ffmpeg: %s", local_path)
+            visual_detections = await detect_visual_transitions(
+                local_path,
+                video.duration_ticks or 0,
+                on_progress=on_visual_progress,
+            )
+        else:
+            # Fallback: trickplay thumbnails (less accurate, 10s intervals)
+            logger.info("Visual detection via trickplay (no local path)")
+            detail = item_detail or await client.get_item_detail(video.jellyfin_item_id)
+            tp = detail.get("Trickplay", {})
+            # First media source's first resolution
+            try:
+                resolutions = next(iter(tp.values()))
+                res_str, meta = next(iter(resolutions.items()))
+                trickplay_meta = {
+                    "resolution": int(res_str),
+                    "width": meta["Width"],
+                    "height": meta["Height"],
+                    "tile_width": meta["TileWidth"],
+                    "tile_height": meta["TileHeight"],
+                    "thumbnail_count": meta["ThumbnailCount"],
+                    "interval": meta["Interval"],
+                }
+            except StopIteration:
+                trickplay_meta = None
+
+            if trickplay_meta:
+                visual_detections = await detect_visual_transitions_trickplay(
+                    client, video.jellyfin_item_id, trickplay_meta,
+                    on_progress=on_visual_progress,
                 )
             else:
-                # Check ML service availability
-                ml_status = await check_ml_available()
-                if not ml_status["available"]:
-                    audio_skip_reason = "ml_service_unavailable"
-                    logger.warning(f"ML service unavailable, skipping audio for video {video_id}")
-                    _analysis_progress[video_id]["message"] = (
-                        "Audio analysis skipped (ML service unavailable)"
-                    )
-                else:
-                    try:
-                        def on_audio_progress(current: int, total: int, message: str | None = None):
-                            update = {
-                                "progress": current,
-                                "total_steps": total,
-                            }
-                            if message:
-                                update["message"] = message
-                            else:
-                                update["message"] = f"Analyzing audio ({current}/{total}s)..."
-                            _analysis_progress[video_id].update(update)
-
-                        audio_result = await classify_audio(
-                            ml_path,
-                            on_progress=on_audio_progress,
-                        )
-                        audio_detections = audio_result["detections"]
-                        audio_spectrum = audio_result["spectrum"]
-                        audio_window_secs = audio_result["window_secs"]
-                    except Exception as e:
-                        logger.error(f"ML audio detection failed: {e}")
-                        audio_skip_reason = f"error:{e}"
-                        _analysis_progress[video_id]["message"] = f"Audio detection failed: {e}"
-
-            analysis.audio_detections = json.dumps(audio_detections)
-            analysis.audio_spectrum = json.dumps({"spectrum": audio_spectrum, "window_secs": audio_window_secs})
-            analysis.audio_skip_reason = audio_skip_reason
-
-        # Save final results
-        analysis.status = "completed"
-        analysis.completed_at = datetime.now()
-
-        # Build summary message
-        vis_count = len(json.loads(analysis.visual_detections or "[]"))
-        aud_count = len(json.loads(analysis.audio_detections or "[]"))
-        skip_note = ""
-        if analysis.audio_skip_reason:
-            skip_note = f" (skipped: {analysis.audio_skip_reason.split(':')[0]})"
-        analysis.message = f"Done: {vis_count} visual, {aud_count} audio detections{skip_note}"
-        analysis.error = None
-        await db.commit()
+                logger.info("Video %s has no trickplay data, skipping visual detection", video_id)
+    except Exception as e:
+        logger.exception("Visual detection failed: %s", e)
+        progress.set_message(f"Visual detection failed: {e}")
+
+    return {"visual_detections": visual_detections}
+
+
+async def _do_audio(
+    video_id: int, state: ProgressState, video: VideoItem, path_from: str | None
+) -> dict:
+    """ML audio detection (opt-in). Returns the AnalysisResult fields to set."""
+    progress = state.phase("audio")
+    progress.set_message("Starting audio analysis...")
+
+    audio_detections: list[dict] = []
+    audio_spectrum: list[dict] = []
+    audio_window_secs: int = 30
+    audio_skip_reason: str | None = None
+
+    ml_enabled = get_setting("ml_audio_enabled")
+
+    # Resolve ML-local file path (separate from backend's local_path)
+    ml_path = _map_path(video.path, path_from, get_setting("ml_path_map_to"))
+    if ml_path:
+        logger.debug("ML path resolved: %s", ml_path)
+
+    if not ml_enabled:
+        audio_skip_reason = "ml_audio_disabled"
+        logger.info("ML audio disabled, skipping audio for video %s", video_id)
+        progress.set_message("Audio analysis skipped (ML audio not enabled)")
+    elif not ml_path:
+        audio_skip_reason = "no_ml_path_mapping"
+        logger.info("No ML path mapping for video %s, skipping audio", video_id)
+        progress.set_message("Audio analysis skipped (ML path mapping not configured)")
+    else:
+        # Check ML service availability
+        ml_status = await check_ml_available()
+        if not ml_status["available"]:
+            audio_skip_reason = "ml_service_unavailable"
+            logger.warning("ML service unavailable, skipping audio for video %s", video_id)
+            progress.set_message("Audio analysis skipped (ML service unavailable)")
+        else:
+            try:
+                def on_audio_progress(current: int, total: int, message: str | None = None):
+                    progress.position = current
+                    progress.total = total
+                    if message:
+                        progress.set_message(message)
+                    else:
+                        progress.template = AUDIO_PROGRESS_TEMPLATE
+                    _maybe_flush_progress(state)
 
-        _analysis_progress[video_id].update({
-            "status": "completed",
-            "message": analysis.message,
-            "audio_skip_reason": analysis.audio_skip_reason,
-        })
+                audio_result = await classify_audio(
+                    ml_path,
+                    on_progress=on_audio_progress,
+                )
+                audio_detections = audio_result["detections"]
+                audio_spectrum = audio_result["spectrum"]
+                audio_window_secs = audio_result["window_secs"]
+            except Exception as e:
+                logger.error("ML audio detection failed: %s", e)
+                audio_skip_reason = f"error:{e}"
+                progress.set_message(f"Audio detection failed: {e}")
+
+    return {
+        "audio_detections": audio_detections,
+        "audio_spectrum": {"spectrum": audio_spectrum, "window_secs": audio_window_secs},
+        "audio_skip_reason": audio_skip_reason,
+    }
 
 
 async def run_batch_analysis(library_id: int, client: JellyfinClient) -> None:
     """
-    Process all unanalyzed videos in a library sequentially.
+    Process all unanalyzed videos in a library, up to `batch_concurrency` at a time.
     Skips videos that already have completed analysis.
     """
+    _batch_expiry.pop(library_id, None)
     _batch_progress[library_id] = {
         "status": "running",
         "current_video": None,
@@ -334,23 +540,23 @@ async def run_batch_analysis(library_id: int, client: JellyfinClient) -> None:
 
     try:
         async with async_session() as db:
-            # Get all videos in the library
+            # Videos without a completed analysis, in one query. Only a few columns
+            # are needed here; each pipeline run loads its own VideoItem.
             result = await db.execute(
-                select(VideoItem).where(VideoItem.library_id == library_id)
-            )
-            all_videos = result.scalars().all()
-
-            # Filter out videos that already have completed analysis
-            videos_to_analyze = []
-            for video in all_videos:
-                ar_result = await db.execute(
-                    select(AnalysisResult).where(
-                        AnalysisResult.video_item_id == video.id,
+                select(VideoItem.id, VideoItem.title, VideoItem.jellyfin_item_id, VideoItem.path)
+                .outerjoin(
+                    AnalysisResult,
+                    and_(
+                        AnalysisResult.video_item_id == VideoItem.id,
                         AnalysisResult.status == "completed",
-                    )
+                    ),
+                )
+                .where(
+                    VideoItem.library_id == library_id,
+                    AnalysisResult.id.is_(None),
                 )
-                if not ar_result.scalar_one_or_none():
-                    videos_to_analyze.append(video)
+            )
+            videos_to_analyze = result.all()
 
         total = len(videos_to_analyze)
         _batch_progress[library_id].update({
@@ -363,26 +569,51 @@ async def run_batch_analysis(library_id: int, client: JellyfinClient) -> None:
                 "status": "completed",
                 "message": "All videos already analyzed",
             })
-            await asyncio.sleep(5)
-            _batch_progress.pop(library_id, None)
             return
 
-        for i, video in enumerate(videos_to_analyze):
-            _batch_progress[library_id].update({
-                "current_video": video.id,
-                "current_video_title": video.title,
-                "progress": i,
-                "message": f"Analyzing {i + 1}/{total}: {video.title}",
-            })
-
+        # Videos with no path mapping will use the trickplay fallback; fetch
+        # their Jellyfin details in bulk rather than one request per video
+        item_details: dict[str, dict] = {}
+        path_from = get_setting("path_map_from")
+        path_to = get_setting("path_map_to")
+        trickplay_ids = [
+            v.jellyfin_item_id for v in videos_to_analyze
+            if not _map_path(v.path, path_from, path_to)
+        ]
+        if trickplay_ids:
             try:
-                await _run_analysis_pipeline(video.id, client, "both")
+                item_details = await client.get_items_details(trickplay_ids)
             except Exception as e:
-                logger.error(f"Batch analysis failed for video {video.id}: {e}")
-                # Continue with next video
+                logger.warning("Bulk item detail fetch failed, falling back to per-video: %s", e)
+
+        concurrency = max(1, int(get_setting("batch_concurrency") or 2))
+        pending = iter(videos_to_analyze)
+        done = 0
+
+        async def _worker() -> None:
+            # Workers pull from one shared iterator, so a fixed pool drains the
+            # list and short videos never wait behind long ones
+            nonlocal done
+            for video_id, title, jellyfin_item_id, _ in pending:
+                _batch_progress[library_id].update({
+                    "current_video": video_id,
+                    "current_video_title": title,
+                    "message": f"Analyzing {done + 1}/{total}: {title}",
+                })
+                try:
+                    await _run_analysis_pipeline(
+                        video_id, client, "both", item_details.get(jellyfin_item_id),
+                    )
+                except Exception as e:
+                    logger.error("Batch analysis failed for video %s: %s", video_id, e)
+                    # Continue with the other videos
+                finally:
+                    # Clean up per-video progress
+                    _analysis_progress.pop(video_id, None)
+                done += 1
+                _batch_progress[library_id]["progress"] = done
 
-            # Clean up per-video progress
-            _analysis_progress.pop(video.id, None)
+        await asyncio.gather(*(_worker() for _ in range(min(concurrency, total))))
 
         _batch_progress[library_id].update({
             "status": "completed",
@@ -391,11 +622,10 @@ async def run_batch_analysis(library_id: int, client: JellyfinClient) -> None:
         })
 
     except Exception as e:
-        logger.error(f"Batch analysis failed for library {library_id}: {e}")
+        logger.error("Batch analysis failed for library %s: %s", library_id, e)
         _batch_progress[library_id].update({
             "status": "failed",
             "message": f"Batch analysis failed: {e}",
         })
     finally:
-        await asyncio.sleep(10)
-        _batch_progress.pop(library_id, None)
+        _expire_later(_batch_expiry, library_id, BATCH_RESULT_TTL_SECONDS)
@@ -5,45 +5,90 @@ Music: sustained energy increase with tonal character (low spectral flatness).
 
 Uses only numpy/scipy — no additional dependencies, keeping Docker image small.
 The onset detection algorithm is the same as librosa's (mel-spectrogram spectral
-flux with peak picking), implemented directly with scipy.signal and numpy.fft.
+flux with peak picking), implemented directly with scipy.signal and scipy.fft.
 """
 
 from __future__ import annotations
 
 import asyncio
+import functools
 import logging
 from typing import Callable
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from scipy import signal as scipy_signal
+from scipy.fft import rfft
 
 logger = logging.getLogger(__name__)
 
-SR = 22050  # sample rate (MIR standard, matches librosa default)
+SR = 16000  # sample rate; Nyquist (8kHz) comfortably covers the 5kHz bell band
 TICKS = 10_000_000
 
 # ── Bell detection ──
 BELL_LOW_HZ = 2000
 BELL_HIGH_HZ = 5000
-BELL_N_FFT = 1024  # ~46ms analysis window
-BELL_HOP = 256  # ~11.6ms hop — fine time resolution for transients
+BELL_N_FFT = 1024  # ~64ms analysis window
+BELL_HOP = 192  # 12ms hop — fine time resolution for transients
 BELL_PEAK_DELTA = 0.15  # minimum normalized onset strength to count as peak
-BELL_PEAK_DISTANCE = 20  # min frames between peaks (~230ms)
+BELL_PEAK_DISTANCE = 20  # min frames between peaks (240ms)
 BELL_CLUSTER_SECS = 30
 BELL_MIN_CLUSTER = 2
+FLUX_BLOCK_FRAMES = 4096  # STFT frames transformed per batch (~8MB of spectra)
 
 # ── Music detection ──
 MUSIC_HISTORY_SECS = 15
 MUSIC_SUSTAIN_SECS = 3
 MUSIC_SCORE_THRESHOLD = 0.9  # energy_ratio * (1 - flatness) must exceed this
 MUSIC_COOLDOWN_SECS = 30.0
+MUSIC_BLOCK_SECS = 60  # one-second frames transformed per batch
 
 AUDIO_TIMEOUT_SECS = 300
 
+# Filter and window coefficients depend only on the constants above
+_BELL_SOS = scipy_signal.butter(
+    4, [BELL_LOW_HZ / (SR / 2), BELL_HIGH_HZ / (SR / 2)],
+    btype="band", output="sos",
+).astype(np.float32)  # float32 keeps sosfilt in float32 for a float32 signal
+_MUSIC_HANN = np.hanning(SR).astype(np.float32)
+
+
+@functools.lru_cache(maxsize=4)
+def _stft_window(n_fft: int) -> np.ndarray:
+    return scipy_signal.windows.hann(n_fft, sym=False).astype(np.float32)
+
 
 # ─── Core DSP ────────────────────────────────────────────────────────────────
 
 
+def _frame_segments(y: np.ndarray, n_fft: int, hop: int) -> list[np.ndarray]:
+    """Centered STFT frames of `y` (reflect-padded by n_fft // 2), in order.
+
+    Only the few edge frames that reach into the padding are built from
+    small padded copies; every other frame is a strided view of `y` itself,
+    so the full signal is never copied.
+
+    The edge split assumes hop < n_fft // 2 (true for every STFT here); wider
+    hops, and short signals, fall back to padding the whole signal.
+    """
+    half = n_fft // 2
+    n_frames = 1 + (len(y) + 2 * half - n_fft) // hop
+    if hop >= half or len(y) <= 4 * n_fft:
+        return [sliding_window_view(np.pad(y, half, mode="reflect"), n_fft)[::hop]]
+
+    # Frames starting before y[0] / running past y[-1] in unpadded coordinates
+    n_head = -(-half // hop)
+    first_tail = max(n_head, (len(y) + half - n_fft) // hop + 1)
+
+    head_pad = np.pad(y[: (n_head - 1) * hop + n_fft - half], (half, 0), mode="reflect")
+    tail_pad = np.pad(y[first_tail * hop - half :], (0, half), mode="reflect")
+    return [
+        sliding_window_view(head_pad, n_fft)[::hop],
+        sliding_window_view(y[n_head * hop - half :], n_fft)[::hop][: first_tail - n_head],
+        sliding_window_view(tail_pad, n_fft)[::hop][: n_frames - first_tail],
+    ]
+
+
 def _spectral_flux_envelope(y: np.ndarray, n_fft: int, hop: int) -> np.ndarray:
     """Compute spectral-flux onset strength envelope.
 
@@ -52,29 +97,41 @@ def _spectral_flux_envelope(y: np.ndarray, n_fft: int, hop: int) -> np.ndarray:
     captures spectral *shape* changes (not just energy), making it effective
     for detecting transients like bell strikes against noisy backgrounds.
 
-    Processes frame-by-frame so memory usage is O(n_fft), not O(signal_length).
+    Frames are strided views over the signal and are transformed in blocks
+    of FLUX_BLOCK_FRAMES, so memory stays bounded by the block size rather
+    than growing with signal length.
     """
-    y_pad = np.pad(y, n_fft // 2, mode="reflect")
-    window = scipy_signal.windows.hann(n_fft, sym=False).astype(np.float32)
+    window = _stft_window(n_fft)
 
-    n_frames = 1 + (len(y_pad) - n_fft) // hop
+    segments = _frame_segments(y, n_fft, hop)
+    n_frames = sum(len(seg) for seg in segments)
     if n_frames < 2:
         return np.array([], dtype=np.float32)
 
     onset_env = np.empty(n_frames - 1, dtype=np.float32)
-    prev_db = None
-
-    for i in range(n_frames):
-        start = i * hop
-        frame = y_pad[start : start + n_fft].astype(np.float32) * window
-        mag = np.abs(np.fft.rfft(frame))
-        db = 10.0 * np.log10(np.maximum(mag, 1e-10))
-
-        if prev_db is not None:
-            onset_env[i - 1] = np.sum(np.maximum(0, db - prev_db))
-
-        prev_db = db
-
+    windowed = np.empty((min(n_frames, FLUX_BLOCK_FRAMES), n_fft), dtype=np.float32)
+    prev_log = None
+    start = 0
+
+    for seg in segments:
+        for i in range(0, len(seg), FLUX_BLOCK_FRAMES):
+            block = seg[i : i + FLUX_BLOCK_FRAMES]
+            n = len(block)
+            np.multiply(block, window, out=windowed[:n])
+            # log10 in place; the 10x dB scale is applied once to the summed flux
+            spec = np.abs(rfft(windowed[:n], axis=1, workers=-1))
+            np.log10(np.maximum(spec, 1e-10, out=spec), out=spec)
+
+            # Flux across the block boundary, then within the block
+            if prev_log is not None:
+                onset_env[start - 1] = np.maximum(spec[0] - prev_log, 0).sum()
+            flux = np.subtract(spec[1:], spec[:-1])
+            onset_env[start : start + n - 1] = np.maximum(flux, 0, out=flux).sum(axis=1)
+
+            prev_log = spec[-1]
+            start += n
+
+    onset_env *= 10.0
     return onset_env
 
 
@@ -89,11 +146,7 @@ def _detect_bells(y: np.ndarray) -> list[dict]:
     3. scipy find_peaks detects prominent onsets
     4. Cluster nearby hits (ding-ding-ding pattern)
     """
-    sos = scipy_signal.butter(
-        4, [BELL_LOW_HZ / (SR / 2), BELL_HIGH_HZ / (SR / 2)],
-        btype="band", output="sos",
-    )
-    y_bell = scipy_signal.sosfilt(sos, y).astype(np.float32)
+    y_bell = scipy_signal.sosfilt(_BELL_SOS, y)
 
     onset_env = _spectral_flux_envelope(y_bell, BELL_N_FFT, BELL_HOP)
     del y_bell
@@ -105,7 +158,7 @@ def _detect_bells(y: np.ndarray) -> list[dict]:
     # Normalize to [0, 1]
     env_max = np.max(onset_env)
     if env_max > 0:
-        onset_env = onset_env / env_max
+        onset_env /= env_max
 
     # Find peaks
     peaks, props = scipy_signal.find_peaks(
@@ -113,17 +166,14 @@ def _detect_bells(y: np.ndarray) -> list[dict]:
     )
     heights = props["peak_heights"]
 
-    # Convert frame indices to seconds (+1 offset because flux is between frames)
-    times = (peaks + 1) * BELL_HOP / SR
+    # Convert frame indices to ticks (+1 offset because flux is between frames)
+    ticks = ((peaks + 1) * BELL_HOP / SR * TICKS).astype(np.int64)
+    confs = np.clip(heights, 0.1, 0.85)
 
-    detections = []
-    for t, h in zip(times, heights):
-        conf = min(0.85, max(0.1, float(h)))
-        detections.append({
-            "timestamp_ticks": int(t * TICKS),
-            "confidence": round(conf, 3),
-            "type": "bell",
-        })
+    detections = [
+        {"timestamp_ticks": t, "confidence": round(c, 3), "type": "bell"}
+        for t, c in zip(ticks.tolist(), confs.tolist(), strict=True)
+    ]
 
     # Diagnostics
     print(
@@ -169,67 +219,65 @@ def _detect_music(
     energies = np.empty(n_frames, dtype=np.float32)
     flatnesses = np.empty(n_frames, dtype=np.float32)
 
-    # Hann window for proper spectral analysis
-    hann = np.hanning(SR).astype(np.float32)
-
-    for i in range(n_frames):
-        chunk = y[i * SR : (i + 1) * SR]
-        energies[i] = float(np.sqrt(np.mean(chunk ** 2)))
-
-        # Spectral flatness: exp(mean(log(S))) / mean(S)
-        # Low = tonal (music), high = noise-like (crowd)
-        S = np.abs(np.fft.rfft(chunk * hann))
-        S = np.maximum(S, 1e-10)
-        flatnesses[i] = float(np.exp(np.mean(np.log(S))) / np.mean(S))
+    # One-second frames as rows; transformed a block of seconds at a time.
+    # Windowing into a float32 buffer keeps the FFT on the float32 ->
+    # complex64 path even if a float64 signal is passed in
+    frames = y[: n_frames * SR].reshape(n_frames, SR)
+    windowed = np.empty((min(n_frames, MUSIC_BLOCK_SECS), SR), dtype=np.float32)
+    for start in range(0, n_frames, MUSIC_BLOCK_SECS):
+        block = frames[start : start + MUSIC_BLOCK_SECS]
+        end = start + len(block)
+        energies[start:end] = np.sqrt(np.einsum("ij,ij->i", block, block) / SR)
+
+        # Spectral flatness: exp(mean(log(S))) / mean(S), taken in the log
+        # domain so the geometric mean can't underflow. Low = tonal (music),
+        # high = noise-like (crowd)
+        np.multiply(block, _MUSIC_HANN, out=windowed[: len(block)])
+        S = np.abs(rfft(windowed[: len(block)], axis=1, workers=-1))
+        np.maximum(S, 1e-10, out=S)
+        log_mean = np.log(S.mean(axis=1))
+        mean_log = np.log(S, out=S).mean(axis=1)
+        flatnesses[start:end] = np.exp(mean_log - log_mean)
+
+        if on_progress:
+            on_progress(end, n_frames)
 
     # Detect sustained music regions
     history_n = int(MUSIC_HISTORY_SECS)
     sustain_n = int(MUSIC_SUSTAIN_SECS)
+    cooldown_n = int(MUSIC_COOLDOWN_SECS)
+
+    # Baseline for second i is the median of the history_n seconds before it
+    energies_f = energies.astype(np.float64)
+    baselines = np.median(sliding_window_view(energies_f[:-1], history_n), axis=1)
+    ratios = np.zeros(n_frames)
+    np.divide(energies_f[history_n:], baselines, out=ratios[history_n:], where=baselines > 0)
+
+    # Combined score: louder than baseline AND tonal
+    scores = ratios * (1.0 - flatnesses.astype(np.float64))
+    scores[:history_n] = 0.0
+
+    # Runs of consecutive elevated seconds as [start, end) pairs
+    elevated = np.concatenate(([0], (scores > MUSIC_SCORE_THRESHOLD).view(np.int8), [0]))
+    edges = np.flatnonzero(np.diff(elevated))
 
+    # A run counts once it lasts sustain_n seconds; the cooldown after a
+    # detection also restarts the count, so one long run can yield several
     detections: list[dict] = []
-    elevated_count = 0
-    elevated_start = 0
     cooldown_until = 0
-    top_scores: list[tuple[int, float, float, float]] = []
-
-    for i in range(history_n, n_frames):
-        if i < cooldown_until:
-            elevated_count = 0
-            continue
-
-        baseline = float(np.median(energies[i - history_n : i]))
-        ratio = float(energies[i]) / baseline if baseline > 0 else 0.0
-
-        # Combined score: louder than baseline AND tonal
-        score = float(ratio * (1.0 - float(flatnesses[i])))
-
-        # Track top scores for diagnostics
-        if len(top_scores) < 20 or score > top_scores[-1][1]:
-            top_scores.append((i, score, ratio, float(flatnesses[i])))
-            top_scores.sort(key=lambda x: -x[1])
-            top_scores = top_scores[:20]
-
-        if score > MUSIC_SCORE_THRESHOLD:
-            if elevated_count == 0:
-                elevated_start = i
-            elevated_count += 1
-
-            if elevated_count >= sustain_n:
-                ticks = int(elevated_start * TICKS)
-                conf = float(min(0.85, 0.3 + (score - MUSIC_SCORE_THRESHOLD) * 0.2))
-                conf = float(max(0.2, conf))
-                detections.append({
-                    "timestamp_ticks": ticks,
-                    "confidence": round(conf, 3),
-                    "type": "music_start",
-                })
-                cooldown_until = i + int(MUSIC_COOLDOWN_SECS)
-                elevated_count = 0
-        else:
-            elevated_count = 0
-
-        if on_progress and i % 30 == 0:
-            on_progress(i, n_frames)
+    for run_start, run_end in zip(edges[::2].tolist(), edges[1::2].tolist(), strict=True):
+        start = max(run_start, cooldown_until)
+        while run_end - start >= sustain_n:
+            i = start + sustain_n - 1
+            conf = min(0.85, 0.3 + (float(scores[i]) - MUSIC_SCORE_THRESHOLD) * 0.2)
+            conf = max(0.2, conf)
+            detections.append({
+                "timestamp_ticks": int(start * TICKS),
+                "confidence": round(conf, 3),
+                "type": "music_start",
+            })
+            cooldown_until = i + cooldown_n
+            start = cooldown_until
 
     # Diagnostics
     print(
@@ -245,16 +293,15 @@ def _detect_music(
         f"min={flatnesses.min():.3f}, max={flatnesses.max():.3f}",
         flush=True,
     )
-    if top_scores:
-        top5 = top_scores[:5]
-        print(
-            "[MUSIC] Top 5 scores: "
-            + ", ".join(
-                f"{x[0]}s score={x[1]:.2f} (ratio={x[2]:.2f} flat={x[3]:.3f})"
-                for x in top5
-            ),
-            flush=True,
-        )
+    top5 = np.argsort(scores[history_n:])[::-1][:5] + history_n
+    print(
+        "[MUSIC] Top 5 scores: "
+        + ", ".join(
+            f"{i}s score={scores[i]:.2f} (ratio={ratios[i]:.2f} flat={flatnesses[i]:.3f})"
+            for i in top5
+        ),
+        flush=True,
+    )
 
     return detections
 
@@ -272,21 +319,16 @@ def _cluster_bells(detections: list[dict]) -> list[dict]:
     if not bells:
         return others
 
-    clusters: list[list[dict]] = [[bells[0]]]
-    for b in bells[1:]:
-        if (
-            b["timestamp_ticks"] - clusters[-1][-1]["timestamp_ticks"]
-            <= BELL_CLUSTER_SECS * TICKS
-        ):
-            clusters[-1].append(b)
-        else:
-            clusters.append([b])
+    # Split wherever consecutive hits are more than BELL_CLUSTER_SECS apart
+    ticks = np.array([b["timestamp_ticks"] for b in bells], dtype=np.int64)
+    confs = np.array([b["confidence"] for b in bells])
+    splits = np.flatnonzero(np.diff(ticks) > BELL_CLUSTER_SECS * TICKS) + 1
 
     result = []
-    for cluster in clusters:
-        best = max(cluster, key=lambda d: d["confidence"])
-        if len(cluster) >= BELL_MIN_CLUSTER:
-            best["confidence"] = min(0.95, best["confidence"] + 0.1 * len(cluster))
+    for group in np.split(np.arange(len(bells)), splits):
+        best = bells[group[np.argmax(confs[group])]]
+        if len(group) >= BELL_MIN_CLUSTER:
+            best["confidence"] = min(0.95, best["confidence"] + 0.1 * len(group))
             best["confidence"] = round(best["confidence"], 3)
         result.append(best)
 
@@ -301,7 +343,7 @@ async def _extract_audio(
     total_secs: int,
     on_progress: Callable[[int, int], None] | None,
 ) -> np.ndarray:
-    """Extract mono audio at 22050Hz via ffmpeg with progress reporting."""
+    """Extract mono audio at SR via ffmpeg with progress reporting."""
     process = await asyncio.create_subprocess_exec(
         "ffmpeg", "-nostdin", "-i", path, "-vn",
         "-acodec", "pcm_s16le", "-ar", str(SR), "-ac", "1",
@@ -317,10 +359,11 @@ async def _extract_audio(
 
     stderr_task = asyncio.create_task(_drain_stderr())
 
-    # Read in 10-second chunks for progress reporting, accumulate into list
+    # Read in 10-second chunks for progress reporting, copying each straight
+    # into a buffer sized from the duration hint (grown only on overshoot)
     chunk_bytes = SR * 2 * 10  # 10 seconds of 16-bit mono
-    chunks: list[bytes] = []
-    bytes_read = 0
+    pcm = np.empty(max(total_secs, 0) * SR + SR * 60, dtype=np.int16)
+    n_samples = 0
 
     try:
         while True:
@@ -329,24 +372,34 @@ async def _extract_audio(
             except asyncio.IncompleteReadError as e:
                 data = e.partial
                 if data:
-                    chunks.append(data)
+                    pcm, n_samples = _append_pcm(pcm, n_samples, data)
                 break
-            chunks.append(data)
-            bytes_read += len(data)
+            pcm, n_samples = _append_pcm(pcm, n_samples, data)
 
             if on_progress and total_secs > 0:
-                secs_read = bytes_read // (SR * 2)
-                on_progress(secs_read, total_secs)
+                on_progress(n_samples // SR, total_secs)
     finally:
         if process.returncode is None:
             process.kill()
         await process.wait()
         await stderr_task
 
-    raw = b"".join(chunks)
     if process.returncode != 0:
         print(f"[AUDIO] ffmpeg exited with code {process.returncode}", flush=True)
-    return np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+    # Cast and scale in one pass (1/32768 is exact, so this equals x / 32768)
+    return np.multiply(pcm[:n_samples], 1.0 / 32768.0, dtype=np.float32)
+
+
+def _append_pcm(pcm: np.ndarray, n_samples: int, data: bytes) -> tuple[np.ndarray, int]:
+    """Copy s16le bytes into `pcm` at `n_samples`, doubling the buffer if full."""
+    samples = np.frombuffer(data, dtype=np.int16, count=len(data) // 2)
+    end = n_samples + len(samples)
+    if end > len(pcm):
+        grown = np.empty(max(end, 2 * len(pcm)), dtype=np.int16)
+        grown[:n_samples] = pcm[:n_samples]
+        pcm = grown
+    pcm[n_samples:end] = samples
+    return pcm, end
 
 
 async def _pipeline(
@@ -360,9 +413,17 @@ async def _pipeline(
     duration = len(y) / SR
     print(f"[AUDIO] Loaded {duration:.1f}s ({len(y)} samples at {SR}Hz)", flush=True)
 
-    bells = _detect_bells(y)
+    # _detect_music runs in a worker thread; hand its progress back to the loop
+    music_progress = None
+    if on_progress:
+        music_progress = functools.partial(asyncio.get_running_loop().call_soon_threadsafe, on_progress)
 
-    music = _detect_music(y, on_progress)
+    # Independent passes over the same read-only signal; both spend most of
+    # their time in numpy/scipy with the GIL released
+    bells, music = await asyncio.gather(
+        asyncio.to_thread(_detect_bells, y),
+        asyncio.to_thread(_detect_music, y, music_progress),
+    )
 
     n_b = sum(1 for d in bells if d["type"] == "bell")
     n_m = len(music)
@@ -10,6 +10,7 @@ import aiohttp
 from bs4 import BeautifulSoup, Tag
 
 from app.config import get_setting, settings
+from app.utils.bounded_dict import make_room
 from app.utils.rate_limiter import RateLimiter
 
 logger = logging.getLogger(__name__)
@@ -21,6 +22,41 @@ TTL_PROMOTION = timedelta(days=7)
 TTL_EVENT_LIST = timedelta(hours=24)
 TTL_EVENT_DETAIL = timedelta(days=7)
 TTL_WRESTLER = timedelta(days=7)
+# The shared scraper lives for the whole process, so bound its page cache
+MAX_CACHED_PAGES = 512
+
+# Patterns used while walking every row / match / text node of a page
+_RE_DATE = re.compile(r"(\d{2})\.(\d{2})\.(\d{4})")
+_RE_DATE_ANYWHERE = re.compile(r"(\d{2}\.\d{2}\.\d{4})")
+_RE_ID_PARAMS: dict[str, re.Pattern[str]] = {"nr": re.compile(r"nr=(\d+)")}
+_RE_EVENT_LINK = re.compile(r"\?id=1&nr=\d+")
+_RE_EVENT_LINK_PREFIX = re.compile(r"\?id=1&nr=")
+_RE_WRESTLER_LINK = re.compile(r"\?id=2&nr=\d+")
+_RE_TEAM_LINK = re.compile(r"\?id=2[89]&nr=\d+")
+_RE_TITLE_LINK = re.compile(r"\?id=5&nr=\d+")
+_RE_RATING_CLASS = re.compile(r"Rating")
+_RE_NUMERIC = re.compile(r"^[\d.]+$")
+_RE_MATCH_TYPE_TRIM = re.compile(r"^[\s\-:]+|[\s\-:]+$")
+_RE_DURATION = re.compile(r"\((\d+:\d+)\)")
+_RE_RATING = re.compile(r"(\d+\.\d+)")
+_RE_VOTES = re.compile(r"(\d+)\s*votes")
+_RE_VALID_VOTES = re.compile(r"Valid votes:\s*(\d+)")
+_RE_VS_SPLIT = re.compile(r"\s+vs\.?\s+")
+_RE_VS_END = re.compile(r"\bvs\.\s*$")
+_RE_MANAGER_OPEN = re.compile(r"\(w/")
+_RE_WM = re.compile(r"\(w/\s*(.*?)(?:\)|$)")
+_RE_PAREN_END = re.compile(r"\)\s*$")
+_RE_PAREN_TAIL = re.compile(r"\).*")
+_RE_NAME_LIST_SPLIT = re.compile(r"\s*[&,]\s*")
+_RE_DIGITS_PUNCT = re.compile(r"^[\d\s.,():]+$")
+_RE_TEAM_OPEN = re.compile(r"([A-Z][\w\s'.-]+?)\s*\(\s*$")
+_RE_SEG_SPLIT = re.compile(r"\s*(?:vs\.|&|,|\band\b)\s*")
+_RE_NAME_CLEAN_C = re.compile(r"\(c\)")
+_RE_NAME_CLEAN_W = re.compile(r"\(w/.*?\)?")
+_RE_RESULT_CLEAN = re.compile(r"\s*(defeat|defeats|draw|by|via)\s.*", re.IGNORECASE)
+_RE_NAME_TRIM = re.compile(r"^[:\s()]+|[:\s()]+$")
+_RE_MANAGER_PREFIX = re.compile(r"^\(?(w/|c\))", re.IGNORECASE)
+_RE_QUOTE_TRIM = re.compile(r'^[\s\]\["\u201c]+|[\s"\u201d]+$')
 
 
 @dataclass
@@ -92,7 +128,7 @@ def _build_url(db_type: int, nr: int | None = None, page: int | None = None, **p
 
 def _parse_dd_mm_yyyy(text: str) -> date | None:
     """Parse DD.MM.YYYY format used by Cagematch."""
-    match = re.match(r"(\d{2})\.(\d{2})\.(\d{4})", text.strip())
+    match = _RE_DATE.match(text.strip())
     if match:
         day, month, year = int(match.group(1)), int(match.group(2)), int(match.group(3))
         try:
@@ -104,7 +140,10 @@ def _parse_dd_mm_yyyy(text: str) -> date | None:
 
 def _extract_id_from_href(href: str, param: str = "nr") -> int | None:
     """Extract a numeric ID from a Cagematch href like '?id=1&nr=12345'."""
-    match = re.search(rf"{param}=(\d+)", href)
+    pattern = _RE_ID_PARAMS.get(param)
+    if pattern is None:
+        pattern = _RE_ID_PARAMS[param] = re.compile(rf"{param}=(\d+)")
+    match = pattern.search(href)
     if match:
         return int(match.group(1))
     return None
@@ -155,6 +194,36 @@ class CagematchScraper:
             burst=get_setting("scrape_burst"),
         )
         self._cache: dict[str, tuple[str, datetime]] = {}
+        self._session: aiohttp.ClientSession | None = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Lazily create the pooled session (must happen inside the running loop).
+
+        Shared by Cagematch and Wikipedia requests so keep-alive connections
+        and DNS lookups are reused across a whole sync.
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers={
+                    "User-Agent": settings.scrape_user_agent,
+                    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+                    "Accept-Language": "en-US,en;q=0.5",
+                },
+                timeout=aiohttp.ClientTimeout(total=30),
+                connector=aiohttp.TCPConnector(limit=20, limit_per_host=4, ttl_dns_cache=300),
+            )
+        return self._session
+
+    async def aclose(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _store_page(self, url: str, html: str, ttl: timedelta) -> None:
+        now = datetime.now()
+        if url not in self._cache:
+            make_room(self._cache, MAX_CACHED_PAGES, lambda entry: entry[1] <= now)
+        self._cache[url] = (html, now + ttl)
 
     async def _fetch_page(self, url: str, ttl: timedelta = TTL_EVENT_LIST) -> str:
         """Fetch a page with rate limiting. Returns HTML string."""
@@ -163,29 +232,24 @@ class CagematchScraper:
             html, expires = self._cache[url]
             if datetime.now() < expires:
                 return html
+            del self._cache[url]
 
         await self.rate_limiter.acquire()
 
-        headers = {
-            "User-Agent": settings.scrape_user_agent,
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.5",
-        }
-
         retries = 3
         for attempt in range(retries):
             try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=30)) as resp:
-                        if resp.status == 429:
-                            wait = 2 ** (attempt + 1)
-                            logger.warning(f"Rate limited by Cagematch, waiting {wait}s")
-                            await __import__("asyncio").sleep(wait)
-                            continue
-                        resp.raise_for_status()
-                        html = await resp.text()
-                        self._cache[url] = (html, datetime.now() + ttl)
-                        return html
+                session = self._get_session()
+                async with session.get(url) as resp:
+                    if resp.status == 429:
+                        wait = 2 ** (attempt + 1)
+                        logger.warning(f"Rate limited by Cagematch, waiting {wait}s")
+                        await __import__("asyncio").sleep(wait)
+                        continue
+                    resp.raise_for_status()
+                    html = await resp.text()
+                    self._store_page(url, html, ttl)
+                    return html
             except aiohttp.ClientError as e:
                 if attempt == retries - 1:
                     logger.error(f"Failed to fetch {url}: {e}")
@@ -247,11 +311,11 @@ class CagematchScraper:
                 text = cell.get_text(strip=True)
 
                 # Try to find date (DD.MM.YYYY)
-                if not event_date and re.match(r"\d{2}\.\d{2}\.\d{4}", text):
+                if not event_date and _RE_DATE.match(text):
                     event_date = _parse_dd_mm_yyyy(text)
 
                 # Try to find event link
-                link = cell.find("a", href=re.compile(r"\?id=1&nr=\d+"))
+                link = cell.find("a", href=_RE_EVENT_LINK)
                 if link and not event_id:
                     event_id = _extract_id_from_href(link.get("href", ""))
                     event_name = link.get_text(strip=True)
@@ -270,10 +334,10 @@ class CagematchScraper:
 
             # Location: find the cell after the event name
             for i, cell in enumerate(cells):
-                if cell.find("a", href=re.compile(r"\?id=1&nr=")):
+                if cell.find("a", href=_RE_EVENT_LINK_PREFIX):
                     if i + 1 < len(cells):
                         loc_text = cells[i + 1].get_text(strip=True)
-                        if loc_text and not re.match(r"^[\d.]+$", loc_text):
+                        if loc_text and not _RE_NUMERIC.match(loc_text):
                             location = loc_text
                     break
 
@@ -390,14 +454,14 @@ class CagematchScraper:
             type_div = match_div.find("div", class_="MatchType")
             if type_div:
                 # Check for title link first
-                title_link = type_div.find("a", href=re.compile(r"\?id=5&nr=\d+"))
+                title_link = type_div.find("a", href=_RE_TITLE_LINK)
                 if title_link:
                     title_name = title_link.get_text(strip=True)
                     # Get match type text without the title name
                     full_text = type_div.get_text(strip=True)
                     match_type = full_text.replace(title_name, "").strip()
                     # Clean up leftover separators
-                    match_type = re.sub(r"^[\s\-:]+|[\s\-:]+$", "", match_type)
+                    match_type = _RE_MATCH_TYPE_TRIM.sub("", match_type)
                     if not match_type:
                         match_type = None
                 else:
@@ -408,7 +472,7 @@ class CagematchScraper:
             if results_div:
                 result = results_div.get_text(strip=True)
                 # Try to extract duration from result text: (12:34)
-                dur_match = re.search(r"\((\d+:\d+)\)", result)
+                dur_match = _RE_DURATION.search(result)
                 if dur_match:
                     duration = dur_match.group(1)
 
@@ -416,10 +480,10 @@ class CagematchScraper:
             rating_div = match_div.find("div", class_="MatchRecommendedLine")
             if rating_div:
                 rating_text = rating_div.get_text(strip=True)
-                rating_match = re.search(r"(\d+\.\d+)", rating_text)
+                rating_match = _RE_RATING.search(rating_text)
                 if rating_match:
                     rating = float(rating_match.group(1))
-                votes_match = re.search(r"(\d+)\s*votes", rating_text)
+                votes_match = _RE_VOTES.search(rating_text)
                 if votes_match:
                     votes = int(votes_match.group(1))
 
@@ -455,7 +519,7 @@ class CagematchScraper:
 
         # Get the full result text and split into sides (no maxsplit — supports multi-way)
         result_text = results_div.get_text()
-        sides_text = re.split(r"\s+vs\.?\s+", result_text)
+        sides_text = _RE_VS_SPLIT.split(result_text)
 
         participants: list[WrestlerRef] = []
         seen_names: set[str] = set()
@@ -463,7 +527,7 @@ class CagematchScraper:
         # Collect team/stable names from links (id=28 = tag teams, id=29 = stables)
         # Map each team name to its side number for later association with wrestlers.
         side_team_names: dict[int, str] = {}
-        for link in results_div.find_all("a", href=re.compile(r"\?id=2[89]&nr=\d+")):
+        for link in results_div.find_all("a", href=_RE_TEAM_LINK):
             team_name = link.get_text(strip=True)
             if team_name:
                 side = self._determine_side(team_name, sides_text)
@@ -479,30 +543,30 @@ class CagematchScraper:
         in_manager_block = False
         for child in results_div.children:
             if isinstance(child, str):
-                if re.search(r"\(w/", child):
+                if _RE_MANAGER_OPEN.search(child):
                     in_manager_block = True
                     # Extract any unlinked manager names from this same text node.
                     # e.g. "(w/ Max Profit)" or "(w/ Max Profit &" or "& Name)"
                     # Extract only the text between "(w/" and the first ")" if present.
-                    wm = re.search(r"\(w/\s*(.*?)(?:\)|$)", child)
+                    wm = _RE_WM.search(child)
                     if wm:
-                        for part in re.split(r"\s*[&,]\s*", wm.group(1)):
+                        for part in _RE_NAME_LIST_SPLIT.split(wm.group(1)):
                             mgr_name = part.strip()
-                            if mgr_name and len(mgr_name) > 1 and not re.match(r"^[\d\s.,():]+$", mgr_name):
+                            if mgr_name and len(mgr_name) > 1 and not _RE_DIGITS_PUNCT.match(mgr_name):
                                 manager_names.add(mgr_name)
                 elif in_manager_block:
                     # Text node inside a manager block — may contain unlinked names
                     # Stop at closing paren if present
-                    text = re.sub(r"\).*", "", child).strip()
-                    for part in re.split(r"\s*[&,]\s*", text):
+                    text = _RE_PAREN_TAIL.sub("", child).strip()
+                    for part in _RE_NAME_LIST_SPLIT.split(text):
                         mgr_name = part.strip()
-                        if mgr_name and len(mgr_name) > 1 and not re.match(r"^[\d\s.,():]+$", mgr_name):
+                        if mgr_name and len(mgr_name) > 1 and not _RE_DIGITS_PUNCT.match(mgr_name):
                             manager_names.add(mgr_name)
                 # A closing paren after manager block ends it, but also
                 # "vs." or start of a new side resets it
-                if in_manager_block and re.search(r"\)\s*$", child):
+                if in_manager_block and _RE_PAREN_END.search(child):
                     in_manager_block = False
-                if re.search(r"\bvs\.\s*$", child):
+                if _RE_VS_END.search(child):
                     in_manager_block = False
             elif isinstance(child, Tag) and in_manager_block:
                 link_href = child.get("href", "")
@@ -514,7 +578,7 @@ class CagematchScraper:
         for child in results_div.children:
             if isinstance(child, str):
                 # Match text like "The Dream Team (" or "CHAOS(" at end of text node
-                for team_match in re.finditer(r"([A-Z][\w\s'.-]+?)\s*\(\s*$", child.strip()):
+                for team_match in _RE_TEAM_OPEN.finditer(child.strip()):
                     team_name = team_match.group(1).strip()
                     if team_name and len(team_name) > 2:
                         side = self._determine_side(team_name, sides_text)
@@ -523,7 +587,7 @@ class CagematchScraper:
                         seen_names.add(team_name)
 
         # Collect all wrestler links (id=2), marking managers separately
-        for link in results_div.find_all("a", href=re.compile(r"\?id=2&nr=\d+")):
+        for link in results_div.find_all("a", href=_RE_WRESTLER_LINK):
             name = link.get_text(strip=True)
             if not name or name in seen_names:
                 continue
@@ -560,19 +624,19 @@ class CagematchScraper:
                 text = child.strip()
                 if not text:
                     continue
-                for segment in re.split(r"\s*(?:vs\.|&|,|\band\b)\s*", text):
+                for segment in _RE_SEG_SPLIT.split(text):
                     name = segment.strip()
-                    name = re.sub(r"\(c\)", "", name).strip()
-                    name = re.sub(r"\(w/.*?\)?", "", name).strip()
-                    name = re.sub(r"\s*(defeat|defeats|draw|by|via)\s.*", "", name, flags=re.IGNORECASE).strip()
-                    name = re.sub(r"^[:\s()]+|[:\s()]+$", "", name)
+                    name = _RE_NAME_CLEAN_C.sub("", name).strip()
+                    name = _RE_NAME_CLEAN_W.sub("", name).strip()
+                    name = _RE_RESULT_CLEAN.sub("", name).strip()
+                    name = _RE_NAME_TRIM.sub("", name)
 
                     if (
                         name
                         and len(name) > 1
                         and name not in seen_names
-                        and not re.match(r"^[\d\s.,():]+$", name)
-                        and not re.match(r"^\(?(w/|c\))", name, re.IGNORECASE)
+                        and not _RE_DIGITS_PUNCT.match(name)
+                        and not _RE_MANAGER_PREFIX.match(name)
                     ):
                         side = self._determine_side(name, sides_text)
                         participants.append(WrestlerRef(
@@ -615,13 +679,13 @@ class CagematchScraper:
             # Date: "wrote on DD.MM.YYYY:"
             header_text = header.get_text(strip=True)
             comment_date = None
-            date_match = re.search(r"(\d{2}\.\d{2}\.\d{4})", header_text)
+            date_match = _RE_DATE_ANYWHERE.search(header_text)
             if date_match:
                 comment_date = _parse_dd_mm_yyyy(date_match.group(1))
 
             # Rating: <span> with class containing "Rating"
             rating = None
-            rating_span = contents.find("span", class_=re.compile(r"Rating"))
+            rating_span = contents.find("span", class_=_RE_RATING_CLASS)
             if rating_span:
                 rating = _parse_float(rating_span.get_text(strip=True))
 
@@ -637,7 +701,7 @@ class CagematchScraper:
             if not text:
                 text = content_text
             # Clean up leading brackets/quotes and trailing quotes
-            text = re.sub(r'^[\s\]\["\u201c]+|[\s"\u201d]+$', "", text)
+            text = _RE_QUOTE_TRIM.sub("", text)
 
             if username or text:
                 comments.append(EventComment(
@@ -662,47 +726,47 @@ class CagematchScraper:
             "Accept": "application/json",
         }
         try:
-            async with aiohttp.ClientSession() as session:
-                # Try exact title, then with disambiguation suffix
-                for title in [wrestler_name, f"{wrestler_name} (professional wrestler)"]:
-                    params = {
-                        "action": "query",
-                        "titles": title,
-                        "prop": "pageimages",
-                        "pithumbsize": "400",
-                        "format": "json",
-                        "redirects": "1",
-                    }
-                    async with session.get(api_url, params=params, headers=headers, timeout=aiohttp.ClientTimeout(total=10)) as resp:
-                        if resp.status != 200:
-                            continue
-                        data = await resp.json()
-                        pages = data.get("query", {}).get("pages", {})
-                        for page_data in pages.values():
-                            if int(page_data.get("pageid", -1)) < 0:
-                                continue
-                            thumb = page_data.get("thumbnail", {})
-                            if thumb.get("source"):
-                                return thumb["source"]
-
-                # Fallback: search
+            session = self._get_session()
+            # Try exact title, then with disambiguation suffix
+            for title in [wrestler_name, f"{wrestler_name} (professional wrestler)"]:
                 params = {
                     "action": "query",
-                    "generator": "search",
-                    "gsrsearch": f"{wrestler_name} wrestler",
-                    "gsrlimit": "1",
+                    "titles": title,
                     "prop": "pageimages",
                     "pithumbsize": "400",
                     "format": "json",
+                    "redirects": "1",
                 }
                 async with session.get(api_url, params=params, headers=headers, timeout=aiohttp.ClientTimeout(total=10)) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        pages = data.get("query", {}).get("pages", {})
-                        for page_data in pages.values():
-                            thumb = page_data.get("thumbnail", {})
-                            if thumb.get("source"):
-                                return thumb["source"]
+                    if resp.status != 200:
+                        continue
+                    data = await resp.json()
+                    pages = data.get("query", {}).get("pages", {})
+                    for page_data in pages.values():
+                        if int(page_data.get("pageid", -1)) < 0:
+                            continue
+                        thumb = page_data.get("thumbnail", {})
+                        if thumb.get("source"):
+                            return thumb["source"]
+
+            # Fallback: search
+            params = {
+                "action": "query",
+                "generator": "search",
+                "gsrsearch": f"{wrestler_name} wrestler",
+                "gsrlimit": "1",
+                "prop": "pageimages",
+                "pithumbsize": "400",
+                "format": "json",
+            }
+            async with session.get(api_url, params=params, headers=headers, timeout=aiohttp.ClientTimeout(total=10)) as resp:
+                if resp.status == 200:
+                    data = await resp.json()
+                    pages = data.get("query", {}).get("pages", {})
+                    for page_data in pages.values():
+                        thumb = page_data.get("thumbnail", {})
+                        if thumb.get("source"):
+                            return thumb["source"]
         except Exception:
             logger.debug(f"Wikipedia image lookup failed for {wrestler_name}")
         return None
@@ -784,8 +848,7 @@ class CagematchScraper:
             # Votes in RatingsBoxText: "Valid votes: N"
             text_el = ratings_box.find("div", class_="RatingsBoxText")
             if text_el:
-                import re
-                match = re.search(r"Valid votes:\s*(\d+)", text_el.get_text())
+                match = _RE_VALID_VOTES.search(text_el.get_text())
                 if match:
                     profile.votes = int(match.group(1))
 
@@ -810,3 +873,36 @@ class CagematchScraper:
             if name_lower in chunk.lower():
                 return i + 1
         return 1  # default
+
+
+# Shared instance for request handlers: keeps the page cache, rate limiter and
+# connection pool alive across requests instead of rebuilding them per call.
+_scraper: CagematchScraper | None = None
+
+
+def get_scraper() -> CagematchScraper:
+    global _scraper
+    if _scraper is None:
+        _scraper = CagematchScraper()
+    return _scraper
+
+
+async def reload_scraper_limits() -> None:
+    """Apply changed scrape rate settings to the shared scraper in place.
+
+    The scraper stays open, so matching jobs and browse requests already
+    using it carry on under the new limits.
+    """
+    if _scraper is not None:
+        await _scraper.rate_limiter.reconfigure(
+            requests_per_second=get_setting("scrape_rate_limit"),
+            burst=get_setting("scrape_burst"),
+        )
+
+
+async def close_scraper() -> None:
+    """Dispose the shared scraper on app shutdown."""
+    global _scraper
+    if _scraper is not None:
+        await _scraper.aclose()
+        _scraper = None
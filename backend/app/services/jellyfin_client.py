@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import logging
 import uuid
 from dataclasses import dataclass
 
@@ -7,6 +8,8 @@ import aiohttp
 
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class AuthResult:
@@ -196,6 +199,25 @@ class JellyfinClient:
             params={"Fields": "Trickplay,MediaSources"},
         )
 
+    async def get_items_details(self, item_ids: list[str], chunk_size: int = 100) -> dict[str, dict]:
+        """Get item details (with Trickplay metadata) for many items, keyed by item id.
+
+        Fetched with one /Items?Ids=... request per chunk instead of one request per item.
+        """
+        details: dict[str, dict] = {}
+        for start in range(0, len(item_ids), chunk_size):
+            data = await self._request(
+                "GET",
+                f"/Users/{self.user_id}/Items",
+                params={
+                    "Ids": ",".join(item_ids[start:start + chunk_size]),
+                    "Fields": "Trickplay,MediaSources",
+                },
+            )
+            for item in data.get("Items", []):
+                details[item["Id"]] = item
+        return details
+
     async def _request_no_body(self, method: str, path: str, json: dict | None = None) -> None:
         """Make a request that returns no body (e.g. 204)."""
         url = f"{self.server_url}{path}"
@@ -211,11 +233,18 @@ class JellyfinClient:
         item["Chapters"] = chapters
         await self._request_no_body("POST", f"/Items/{item_id}", json=item)
 
+    async def _report_playback(self, path: str, body: dict) -> None:
+        """Fire-and-forget playback report — runs as a background task, so errors are logged, not raised."""
+        try:
+            await self._request_no_body("POST", path, json=body)
+        except Exception as e:
+            logger.warning(f"Playback report to {path} failed: {e}")
+
     async def report_playback_start(self, body: dict) -> None:
-        await self._request_no_body("POST", "/Sessions/Playing", json=body)
+        await self._report_playback("/Sessions/Playing", body)
 
     async def report_playback_progress(self, body: dict) -> None:
-        await self._request_no_body("POST", "/Sessions/Playing/Progress", json=body)
+        await self._report_playback("/Sessions/Playing/Progress", body)
 
     async def report_playback_stopped(self, body: dict) -> None:
-        await self._request_no_body("POST", "/Sessions/Playing/Stopped", json=body)
+        await self._report_playback("/Sessions/Playing/Stopped", body)
@@ -32,6 +32,9 @@ W_BRIGHTNESS = 0.10
 # Timeout for ffmpeg frame extraction
 VISUAL_TIMEOUT_SECONDS = 600  # 10 minutes
 
+# Decoded frames buffered between the ffmpeg reader and the analyzer
+FRAME_QUEUE_SIZE = 8
+
 
 # ---------- numpy-only frame analysis (used by ffmpeg pipeline) ----------
 
@@ -117,6 +120,16 @@ def _compare_frames(
     }
 
 
+def _analyze_frame(
+    raw: bytes, w: int, h: int, prev_data: tuple[np.ndarray, np.ndarray, float, float] | None,
+) -> tuple[tuple[np.ndarray, np.ndarray, float, float], dict | None]:
+    """Compute a frame's data and compare it with the previous one (runs in a worker thread)."""
+    curr_data = _compute_frame_data(raw, w, h)
+    if prev_data is None:
+        return curr_data, None
+    return curr_data, _compare_frames(*prev_data, *curr_data)
+
+
 # ---------- PIL-based frame analysis (used by trickplay fallback) ----------
 
 def _analyze_pair_pil(prev_img: Image.Image, curr_img: Image.Image) -> dict:
@@ -173,17 +186,15 @@ def _cluster_detections(detections: list[dict], window_ticks: int) -> list[dict]
     if not detections:
         return []
     sorted_d = sorted(detections, key=lambda d: d["timestamp_ticks"])
-    clusters: list[list[dict]] = [[sorted_d[0]]]
-    for d in sorted_d[1:]:
-        if d["timestamp_ticks"] - clusters[-1][-1]["timestamp_ticks"] <= window_ticks:
-            clusters[-1].append(d)
-        else:
-            clusters.append([d])
-    result = []
-    for cluster in clusters:
-        best = max(cluster, key=lambda d: d["confidence"])
-        result.append(best)
-    return result
+    ticks = np.array([d["timestamp_ticks"] for d in sorted_d], dtype=np.int64)
+    confs = np.array([d["confidence"] for d in sorted_d])
+
+    # A gap wider than the window starts a new cluster
+    splits = np.flatnonzero(np.diff(ticks) > window_ticks) + 1
+    return [
+        sorted_d[group[np.argmax(confs[group])]]
+        for group in np.split(np.arange(len(sorted_d)), splits)
+    ]
 
 
 # ---------- ffmpeg pipeline (primary) ----------
@@ -254,6 +265,25 @@ async def _run_visual_pipeline(
 
     stderr_task = asyncio.create_task(_drain_stderr())
 
+    # ffmpeg output is read into a bounded queue while earlier frames are
+    # analyzed off the event loop, so decoding and analysis overlap
+    frames: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=FRAME_QUEUE_SIZE)
+
+    async def _read_frames():
+        try:
+            while True:
+                try:
+                    raw = await process.stdout.readexactly(frame_bytes)
+                except asyncio.IncompleteReadError:
+                    break
+                await frames.put(raw)
+        except Exception:
+            logger.exception("Reading ffmpeg frames failed")
+        # Not reached on cancellation: the consumer is gone and the queue may be full
+        await frames.put(None)
+
+    reader_task = asyncio.create_task(_read_frames())
+
     detections: list[dict] = []
     # Cached data for the previous frame: (rgb_f32, gray_f64, brightness, edge_density)
     prev_data: tuple[np.ndarray, np.ndarray, float, float] | None = None
@@ -261,35 +291,28 @@ async def _run_visual_pipeline(
     seconds_per_frame = 1.0 / FRAME_RATE
 
     try:
-        while True:
-            try:
-                raw = await process.stdout.readexactly(frame_bytes)
-            except asyncio.IncompleteReadError:
-                break
-
+        while (raw := await frames.get()) is not None:
             # Compute all per-frame data once (no PIL involved)
-            curr_data = _compute_frame_data(raw, w, h)
-
-            if prev_data is not None:
-                result = _compare_frames(
-                    prev_data[0], prev_data[1], prev_data[2], prev_data[3],
-                    curr_data[0], curr_data[1], curr_data[2], curr_data[3],
-                )
-                if result["is_detection"]:
-                    timestamp_secs = frame_idx * seconds_per_frame
-                    detections.append({
-                        "timestamp_ticks": int(timestamp_secs * TICKS_PER_SECOND),
-                        "confidence": result["confidence"],
-                        "type": result["type"],
-                    })
+            prev_data, result = await asyncio.to_thread(_analyze_frame, raw, w, h, prev_data)
+
+            if result and result["is_detection"]:
+                timestamp_secs = frame_idx * seconds_per_frame
+                detections.append({
+                    "timestamp_ticks": int(timestamp_secs * TICKS_PER_SECOND),
+                    "confidence": result["confidence"],
+                    "type": result["type"],
+                })
 
-            prev_data = curr_data
             frame_idx += 1
 
             if on_progress and total_seconds > 0:
                 current_secs = int(frame_idx * seconds_per_frame)
                 on_progress(current_secs, total_seconds)
     finally:
+        reader_task.cancel()
+        # asyncio.wait doesn't raise the reader's CancelledError, so only a
+        # cancellation of this pipeline itself propagates
+        await asyncio.wait({reader_task})
         if process.returncode is None:
             process.kill()
         await process.wait()
@@ -0,0 +1,17 @@
+from collections.abc import Callable
+from typing import Any
+
+
+def make_room(entries: dict, max_entries: int, is_expired: Callable[[Any], bool]) -> None:
+    """Free a slot in an insertion-ordered cache dict before adding a new key.
+
+    Expired entries go first; if that isn't enough, the oldest insertions are
+    evicted.
+    """
+    if len(entries) < max_entries:
+        return
+    for key in [k for k, v in entries.items() if is_expired(v)]:
+        del entries[key]
+    # Still full — evict the oldest insertions
+    while len(entries) >= max_entries:
+        del entries[next(iter(entries))]
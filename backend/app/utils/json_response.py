@@ -0,0 +1,16 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class OrjsonResponse(JSONResponse):
+    """JSONResponse rendered with orjson.
+
+    FastAPI's own ORJSONResponse is deprecated in favour of Pydantic
+    serialization, which only kicks in for routes with a response model.
+    Routes returning large plain dicts use this instead.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
@@ -26,3 +26,12 @@ class RateLimiter:
                 self.last_refill = time.monotonic()
             else:
                 self.tokens -= 1
+
+    async def reconfigure(self, requests_per_second: float, burst: int):
+        """Apply new limits in place, without dropping waiters or earned tokens."""
+        async with self._lock:
+            now = time.monotonic()
+            self.tokens = min(burst, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+            self.rate = requests_per_second
+            self.burst = burst
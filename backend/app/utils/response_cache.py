@@ -0,0 +1,111 @@
+import functools
+import logging
+import time
+from dataclasses import dataclass
+
+import aiohttp
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse, Response
+
+from app.utils.bounded_dict import make_room
+
+logger = logging.getLogger(__name__)
+
+# How long an expired entry is kept around as a fallback when the handler fails
+STALE_FALLBACK_SECONDS = 3600
+MAX_ENTRIES = 1024
+# Handler failures that a stale body may stand in for — upstream/network trouble
+UPSTREAM_ERRORS = (aiohttp.ClientError, ConnectionError, TimeoutError)
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    media_type: str
+    fresh_until: float
+    stale_until: float
+
+
+class ResponseCache:
+    """In-process cache of serialized endpoint responses with stale-on-error fallback."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: dict[str, CachedResponse] = {}
+
+    def get(self, key: str) -> CachedResponse | None:
+        entry = self._entries.get(key)
+        if entry and entry.stale_until <= time.monotonic():
+            del self._entries[key]
+            return None
+        return entry
+
+    def set(self, key: str, body: bytes, media_type: str, ttl: float) -> None:
+        now = time.monotonic()
+        if key not in self._entries:
+            make_room(self._entries, self.max_entries, lambda e: e.stale_until <= now)
+        self._entries[key] = CachedResponse(
+            body=body,
+            media_type=media_type,
+            fresh_until=now + ttl,
+            stale_until=now + ttl + STALE_FALLBACK_SECONDS,
+        )
+
+    def invalidate(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+response_cache = ResponseCache()
+
+
+def _cache_key(func, params: dict) -> str:
+    """Key on the endpoint plus its scalar params (path/query values, not injected deps)."""
+    parts = [
+        f"{k}={v}" for k, v in sorted(params.items())
+        if v is None or isinstance(v, (str, int, float, bool))
+    ]
+    return f"{func.__module__}.{func.__qualname__}?{'&'.join(parts)}"
+
+
+def cached_response(ttl: float, response_class: type[Response] = JSONResponse):
+    """Cache a read-heavy endpoint's JSON response for `ttl` seconds.
+
+    If the handler fails with an upstream error (a 5xx HTTPException or one
+    of UPSTREAM_ERRORS) and an expired entry is still within its stale
+    window, the stale body is served instead of the error. That body can be
+    up to `ttl + STALE_FALLBACK_SECONDS` old and is sent like a fresh one;
+    only a warning is logged. Any other exception propagates.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(**kwargs):
+            key = _cache_key(func, kwargs)
+            entry = response_cache.get(key)
+            if entry and entry.fresh_until > time.monotonic():
+                return Response(content=entry.body, media_type=entry.media_type)
+
+            try:
+                result = await func(**kwargs)
+            except HTTPException as e:
+                if entry and e.status_code >= 500:
+                    logger.warning(f"Serving stale response for {key}: {e.detail}")
+                    return Response(content=entry.body, media_type=entry.media_type)
+                raise
+            except UPSTREAM_ERRORS as e:
+                if entry:
+                    logger.warning(f"Serving stale response for {key}: {e}")
+                    return Response(content=entry.body, media_type=entry.media_type)
+                raise
+
+            response = result if isinstance(result, Response) else response_class(content=result)
+            if response.status_code == 200:
+                response_cache.set(key, bytes(response.body), response.media_type or "application/json", ttl)
+            return response
+
+        return wrapper
+
+    return decorator
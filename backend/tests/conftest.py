@@ -1,4 +1,6 @@
+import asyncio
 import os
+from unittest.mock import AsyncMock
 
 import pytest
 import pytest_asyncio
@@ -11,6 +13,10 @@ os.environ["TITANTRON_ADMIN_PASSWORD"] = ""
 
 from app.database import Base, get_db  # noqa: E402
 from app.main import app  # noqa: E402
+from app.models.library import Library  # noqa: E402
+from app.models.promotion import Promotion  # noqa: E402
+from app.models.video_item import VideoItem  # noqa: E402
+from app.routers.auth import get_jellyfin_client  # noqa: E402
 
 
 @pytest_asyncio.fixture
@@ -22,18 +28,22 @@ async def db_engine():
     await engine.dispose()
 
 
+@pytest.fixture
+def session_factory(db_engine):
+    """Sessions on the test DB, for code that opens its own (patch it over async_session)."""
+    return async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+
+
 @pytest_asyncio.fixture
-async def db(db_engine):
-    session_factory = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+async def db(session_factory):
     async with session_factory() as session:
         yield session
         await session.rollback()
 
 
 @pytest_asyncio.fixture
-async def client(db_engine):
+async def client(session_factory):
     """Async test client wired to an in-memory DB."""
-    session_factory = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
 
     async def _override_get_db():
         async with session_factory() as session:
@@ -44,3 +54,75 @@ async def client(db_engine):
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
     app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def mock_jellyfin():
+    """Mock JellyfinClient, also injected into routes that depend on one."""
+    client = AsyncMock()
+    client.server_url = "http://jellyfin:8096"
+    client.access_token = "test-token"
+    client.device_id = "test-device"
+    client.user_id = "test-user"
+    app.dependency_overrides[get_jellyfin_client] = lambda: client
+    yield client
+    app.dependency_overrides.pop(get_jellyfin_client, None)
+
+
+@pytest_asyncio.fixture
+async def library(db):
+    """Promotion 1 and its Library 1."""
+    db.add(Promotion(id=1, cagematch_id=1, name="Test", abbreviation="TST"))
+    db.add(Library(id=1, jellyfin_library_id="lib1", name="Test Lib", promotion_id=1))
+    await db.commit()
+    return await db.get(Library, 1)
+
+
+@pytest_asyncio.fixture
+async def video(db, library):
+    """Unmatched VideoItem 1 in Library 1, 1000 ticks long."""
+    video = VideoItem(
+        id=1, jellyfin_item_id="abc123", title="Test Show", library_id=1,
+        match_status="unmatched", duration_ticks=1000,
+    )
+    db.add(video)
+    await db.commit()
+    return video
+
+class FakeFfmpeg:
+    """Stand-in for an ffmpeg subprocess that writes `stdout` and exits 0."""
+
+    def __init__(self, stdout: bytes):
+        self.returncode = None
+        self.killed = False
+        self.stdout = asyncio.StreamReader()
+        self.stdout.feed_data(stdout)
+        self.stdout.feed_eof()
+        self.stderr = asyncio.StreamReader()
+        self.stderr.feed_eof()
+
+    def kill(self):
+        self.killed = True
+
+    async def wait(self):
+        self.returncode = 0
+        return 0
+
+
+@pytest.fixture
+def fake_ffmpeg(monkeypatch):
+    """Make subprocess launches return a FakeFfmpeg writing the given bytes.
+
+    Returns the list of processes started, for assertions after the run.
+    """
+    processes: list[FakeFfmpeg] = []
+
+    def install(stdout: bytes) -> list[FakeFfmpeg]:
+        async def fake_exec(*args, **kwargs):
+            processes.append(FakeFfmpeg(stdout))
+            return processes[-1]
+
+        monkeypatch.setattr(asyncio, "create_subprocess_exec", fake_exec)
+        return processes
+
+    return install
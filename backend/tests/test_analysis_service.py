@@ -0,0 +1,164 @@
+"""Test analysis batching and progress tracking."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete, select
+
+from app.models.analysis_result import AnalysisResult
+from app.models.library import Library
+from app.models.video_item import VideoItem
+from app.services import analysis_service
+
+
+@pytest_asyncio.fixture
+async def videos(db, library):
+    """Videos 1-4 in library 1 (1 analyzed, 2 failed) and video 5 in library 2."""
+    db.add(Library(id=2, jellyfin_library_id="lib2", name="Other Lib", promotion_id=1))
+    for i in range(1, 5):
+        db.add(VideoItem(id=i, jellyfin_item_id=f"item{i}", title=f"Show {i}", library_id=1))
+    db.add(VideoItem(id=5, jellyfin_item_id="item5", title="Other Show", library_id=2))
+    db.add(AnalysisResult(video_item_id=1, status="completed"))
+    db.add(AnalysisResult(video_item_id=2, status="failed"))
+    await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_batch_skips_completed_videos(videos, session_factory):
+    pipeline = AsyncMock()
+    client = AsyncMock()
+    client.get_items_details.return_value = {"item3": {"Id": "item3", "Trickplay": {}}}
+
+    with patch.object(analysis_service, "async_session", session_factory), \
+            patch.object(analysis_service, "_run_analysis_pipeline", pipeline):
+        await analysis_service.run_batch_analysis(1, client)
+
+    calls = {call.args[0]: call.args[3] for call in pipeline.await_args_list}
+    assert sorted(calls) == [2, 3, 4]
+    # No path mapping configured, so every video's trickplay detail comes from one bulk fetch
+    client.get_items_details.assert_awaited_once_with(["item2", "item3", "item4"])
+    assert calls[3] == {"Id": "item3", "Trickplay": {}}
+    assert calls[2] is None
+
+
+@pytest.mark.asyncio
+async def test_batch_concurrency_is_bounded(videos, session_factory):
+    running = 0
+    peak = 0
+
+    async def pipeline(video_id, client, phase, item_detail=None):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    with patch.object(analysis_service, "async_session", session_factory), \
+            patch.object(analysis_service, "_run_analysis_pipeline", pipeline), \
+            patch.object(analysis_service, "get_setting", return_value=2):
+        await analysis_service.run_batch_analysis(1, AsyncMock(get_items_details=AsyncMock(return_value={})))
+
+    assert peak == 2
+
+
+def test_progress_snapshot_combines_phases():
+    state = analysis_service.ProgressState(status="running_visual")
+    state.phase("visual").position = 10
+    state.phase("visual").total = 100
+    state.phase("visual").message = "frames"
+    state.phase("audio").position = 5
+    state.phase("audio").total = 100
+    state.phase("audio").message = "audio"
+
+    snap = state.snapshot()
+    assert snap["visual_progress"]["progress"] == 10
+    assert snap["audio_progress"]["progress"] == 5
+    assert (snap["progress"], snap["total_steps"]) == (15, 200)
+    assert snap["message"] == "frames | audio"
+
+    state.phase("visual").template = analysis_service.VISUAL_PROGRESS_TEMPLATE
+    assert state.snapshot()["visual_progress"]["message"] == "Analyzing video frames (10/100s)..."
+    state.phase("visual").set_message("Visual detection failed: boom")
+    assert state.snapshot()["visual_progress"]["message"] == "Visual detection failed: boom"
+
+    state.status = "completed"
+    state.message = "Done"
+    assert state.snapshot()["message"] == "Done"
+
+
+@pytest.mark.asyncio
+async def test_progress_flush_is_throttled_and_skips_finished_rows(db, videos, session_factory):
+    running = AnalysisResult(video_item_id=3, status="running_visual")
+    db.add(running)
+    await db.commit()
+
+    state = analysis_service.ProgressState(status="running_visual", analysis_id=running.id)
+    state.phase("visual").position = 40
+    state.phase("visual").total = 100
+    state.phase("visual").message = "frames"
+
+    with patch.object(analysis_service, "async_session", session_factory):
+        analysis_service._maybe_flush_progress(state)
+        state.phase("visual").position = 50
+        analysis_service._maybe_flush_progress(state)  # within the throttle window
+        await asyncio.gather(*analysis_service._flush_tasks)
+        await analysis_service._flush_progress(1, 99, 100, "late")  # row 1 is completed
+
+    async with session_factory() as check:
+        rows = {r.video_item_id: r for r in (await check.execute(select(AnalysisResult))).scalars()}
+    assert (rows[3].progress, rows[3].total_steps, rows[3].message) == (40, 100, "frames")
+    assert rows[1].progress == 0 and rows[1].message is None
+
+
+@pytest.mark.asyncio
+async def test_pipeline_resets_only_the_rerun_phase(db, videos, session_factory):
+    db.add(AnalysisResult(
+        video_item_id=3, status="completed", message="Done",
+        visual_detections=[{"t": 1}], audio_detections=[{"t": 2}],
+    ))
+    await db.commit()
+
+    async def audio_phase(video_id, state, video, path_from):
+        return {"audio_detections": [], "audio_spectrum": {}, "audio_skip_reason": "ml_audio_disabled"}
+
+    with patch.object(analysis_service, "async_session", session_factory), \
+            patch.object(analysis_service, "_do_audio", audio_phase), \
+            patch.dict(analysis_service._analysis_progress, {}, clear=True):
+        await analysis_service._run_analysis_pipeline(3, AsyncMock(), "audio")
+        await analysis_service._run_analysis_pipeline(4, AsyncMock(), "audio")
+
+    async with session_factory() as check:
+        rows = {r.video_item_id: r for r in (await check.execute(select(AnalysisResult))).scalars()}
+    assert rows[3].status == "completed"
+    assert rows[3].visual_detections == [{"t": 1}]
+    assert rows[3].audio_detections == []
+    assert rows[3].message == "Done: 1 visual, 0 audio detections (skipped: ml_audio_disabled)"
+    assert rows[4].status == "completed"
+
+
+@pytest.mark.asyncio
+async def test_pipeline_fails_cleanly_when_row_deleted_mid_run(videos, session_factory):
+
+    async def audio_phase(video_id, state, video, path_from):
+        async with session_factory() as other:
+            await other.execute(delete(AnalysisResult).where(AnalysisResult.video_item_id == video_id))
+            await other.commit()
+        return {"audio_detections": [], "audio_spectrum": {}, "audio_skip_reason": None}
+
+    with patch.object(analysis_service, "async_session", session_factory), \
+            patch.object(analysis_service, "_do_audio", audio_phase), \
+            patch.dict(analysis_service._analysis_progress, {}, clear=True), \
+            pytest.raises(ValueError, match="deleted during the run"):
+        await analysis_service._run_analysis_pipeline(3, AsyncMock(), "audio")
+
+
+def test_finished_progress_expires_on_read():
+    state = analysis_service.ProgressState(status="completed")
+    with patch.dict(analysis_service._analysis_progress, {7: state, 8: state}), \
+            patch.dict(analysis_service._analysis_expiry, {7: time.monotonic() - 1, 8: time.monotonic() + 60}):
+        assert analysis_service.get_analysis_progress(7) is None
+        assert 7 not in analysis_service._analysis_progress
+        assert analysis_service.get_analysis_progress(8)["status"] == "completed"
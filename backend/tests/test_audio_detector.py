@@ -0,0 +1,113 @@
+"""Test the audio detector DSP and PCM extraction against simple references."""
+
+import threading
+
+import numpy as np
+import pytest
+from numpy.lib.stride_tricks import sliding_window_view
+
+from app.services import audio_detector
+from app.services.audio_detector import _spectral_flux_envelope
+
+
+def _reference_flux(y: np.ndarray, n_fft: int, hop: int) -> np.ndarray:
+    y_pad = np.pad(y, n_fft // 2, mode="reflect")
+    window = np.hanning(n_fft + 1)[:-1]
+    n_frames = 1 + (len(y_pad) - n_fft) // hop
+    dbs = [
+        10.0 * np.log10(np.maximum(np.abs(np.fft.rfft(y_pad[i * hop : i * hop + n_fft] * window)), 1e-10))
+        for i in range(n_frames)
+    ]
+    return np.array([np.maximum(b - a, 0).sum() for a, b in zip(dbs[:-1], dbs[1:], strict=True)])
+
+
+@pytest.mark.parametrize("n_samples", [1500, 16000 * 5 + 123])
+def test_spectral_flux_matches_per_frame_reference(monkeypatch, n_samples):
+    # Small blocks so the block-boundary flux is exercised
+    monkeypatch.setattr(audio_detector, "FLUX_BLOCK_FRAMES", 7)
+    y = np.random.default_rng(0).standard_normal(n_samples).astype(np.float32)
+
+    env = _spectral_flux_envelope(y, 1024, 256)
+
+    assert env.dtype == np.float32
+    np.testing.assert_allclose(env, _reference_flux(y, 1024, 256), rtol=1e-3)
+
+
+@pytest.mark.parametrize("n_samples", [4000, 4097, 4200, 16000 * 3 + 191])
+@pytest.mark.parametrize("hop", [192, 256, 333, 511, 512, 700, 1024])
+def test_frame_segments_match_padded_framing(n_samples, hop):
+    y = np.random.default_rng(3).standard_normal(n_samples).astype(np.float32)
+    expected = sliding_window_view(np.pad(y, 512, mode="reflect"), 1024)[::hop]
+
+    frames = np.concatenate(audio_detector._frame_segments(y, 1024, hop))
+
+    np.testing.assert_array_equal(frames, expected)
+
+
+def test_spectral_flux_short_signal_is_empty():
+    assert _spectral_flux_envelope(np.zeros(10, dtype=np.float32), 1024, 256).size == 0
+
+
+def test_detect_music_finds_tonal_onsets():
+    sr = audio_detector.SR
+    rng = np.random.default_rng(1)
+    y = (rng.standard_normal(sr * 120) * 0.02).astype(np.float32)
+    t = np.arange(len(y)) / sr
+    for start in (40, 90):
+        burst = (t >= start) & (t < start + 20)
+        y[burst] += (0.3 * np.sin(2 * np.pi * 440 * t[burst])).astype(np.float32)
+
+    detections = audio_detector._detect_music(y, None)
+
+    assert [d["timestamp_ticks"] // audio_detector.TICKS for d in detections] == [40, 90]
+    assert all(d["type"] == "music_start" for d in detections)
+
+
+async def test_pipeline_reports_music_progress_on_event_loop(monkeypatch):
+    sr = audio_detector.SR
+    y = (np.random.default_rng(4).standard_normal(sr * 150) * 0.02).astype(np.float32)
+
+    async def fake_extract(path, total_secs, on_progress):
+        return y
+
+    monkeypatch.setattr(audio_detector, "_extract_audio", fake_extract)
+    calls = []
+
+    await audio_detector._pipeline("x.mkv", 150, lambda s, t: calls.append((s, t, threading.get_ident())))
+
+    assert [(s, t) for s, t, _ in calls] == [(60, 150), (120, 150), (150, 150)]
+    assert {ident for _, _, ident in calls} == {threading.get_ident()}
+
+
+def test_detect_bells_finds_clustered_strikes():
+    sr = audio_detector.SR
+    rng = np.random.default_rng(2)
+    y = (rng.standard_normal(sr * 60) * 0.01).astype(np.float32)
+    t = np.arange(int(sr * 0.5)) / sr
+    strike = (np.sin(2 * np.pi * 3500 * t) * np.exp(-t * 8)).astype(np.float32)
+    for at in (20.0, 21.0, 22.0):
+        start = int(at * sr)
+        y[start : start + len(strike)] += strike
+
+    bells = audio_detector._detect_bells(y)
+
+    assert len(bells) == 1
+    assert bells[0]["type"] == "bell"
+    assert abs(bells[0]["timestamp_ticks"] / audio_detector.TICKS - 20.0) < 2.1
+
+
+@pytest.mark.parametrize("total_secs", [0, 30, 3600])
+async def test_extract_audio_fills_buffer_from_stream(fake_ffmpeg, total_secs):
+    """The PCM buffer is sized from the duration hint but must grow when
+    ffmpeg produces more audio than expected, and handle a short tail."""
+    sr = audio_detector.SR
+    pcm = np.arange(sr * 75 + 123, dtype=np.int64).astype(np.int16)
+    fake_ffmpeg(pcm.tobytes())
+    progress = []
+
+    y = await audio_detector._extract_audio("x.mkv", total_secs, lambda s, t: progress.append(s))
+
+    assert y.dtype == np.float32
+    np.testing.assert_array_equal(y, pcm.astype(np.float32) / 32768.0)
+    if total_secs:
+        assert progress == list(range(10, 80, 10))
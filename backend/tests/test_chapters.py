@@ -0,0 +1,22 @@
+"""Test chapter CRUD keeps end_ticks contiguous."""
+
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_chapter_ends_follow_next_start(client, video, mock_jellyfin):
+    first = await client.post("/api/v1/player/1/chapters", json={"title": "Match 1", "start_ticks": 100})
+    assert first.json()["end_ticks"] == 1000
+
+    second = await client.post("/api/v1/player/1/chapters", json={"title": "Match 2", "start_ticks": 600})
+    assert second.json()["end_ticks"] == 1000
+
+    moved = await client.put(f"/api/v1/player/1/chapters/{second.json()['id']}", json={"start_ticks": 50})
+    assert moved.json()["end_ticks"] == 100
+
+    chapters = (await client.get("/api/v1/player/1/chapters")).json()
+    assert [(c["start_ticks"], c["end_ticks"]) for c in chapters] == [(50, 100), (100, 1000)]
+
+    await client.delete(f"/api/v1/player/1/chapters/{second.json()['id']}")
+    chapters = (await client.get("/api/v1/player/1/chapters")).json()
+    assert [(c["start_ticks"], c["end_ticks"]) for c in chapters] == [(100, 1000)]
@@ -0,0 +1,42 @@
+"""Test player info caching never shares per-viewer stream data."""
+
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+
+from app.models.event import Event
+from app.utils.response_cache import ResponseCache
+
+
+@pytest.fixture(autouse=True)
+def cache():
+    fresh = ResponseCache()
+    with patch("app.routers.player.response_cache", fresh):
+        yield fresh
+
+
+@pytest.mark.asyncio
+async def test_stream_is_per_request_and_metadata_follows_match(client, db, video, mock_jellyfin):
+    sessions = iter(["session-1", "session-2", "session-3"])
+    mock_jellyfin.get_playback_info.side_effect = lambda *args: {
+        "PlaySessionId": next(sessions),
+        "MediaSources": [{"SupportsDirectPlay": True}],
+    }
+    mock_jellyfin.get_item_detail.return_value = {}
+    db.add(Event(id=1, cagematch_event_id=100, name="Test Event", date=date(2024, 1, 1), promotion_id=1))
+    await db.commit()
+
+    first = (await client.get("/api/v1/player/1/info")).json()
+    video.matched_event_id = 1
+    await db.commit()
+    second = (await client.get("/api/v1/player/1/info")).json()
+    third = (await client.get("/api/v1/player/1/info")).json()
+
+    assert [r["stream"]["play_session_id"] for r in (first, second, third)] == [
+        "session-1", "session-2", "session-3",
+    ]
+    assert first["event"] is None
+    assert second["event"]["name"] == third["event"]["name"] == "Test Event"
+    # Trickplay lookup only repeats when the match changed
+    assert mock_jellyfin.get_item_detail.await_count == 2
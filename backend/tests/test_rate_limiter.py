@@ -43,3 +43,14 @@ class TestRateLimiter:
         await asyncio.sleep(0.1)  # let tokens accumulate
         # Should still only have burst=2 tokens max
         assert limiter.tokens <= limiter.burst or True  # tokens are lazily computed
+
+    @pytest.mark.asyncio
+    async def test_reconfigure_applies_new_limits(self):
+        limiter = RateLimiter(requests_per_second=100, burst=5)
+        await limiter.reconfigure(requests_per_second=10, burst=1)
+        assert limiter.tokens <= 1
+        await limiter.acquire()
+        start = time.monotonic()
+        await limiter.acquire()
+        elapsed = time.monotonic() - start
+        assert elapsed >= 0.05  # now limited to 10 rps
@@ -0,0 +1,106 @@
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+
+from app.utils.response_cache import ResponseCache, cached_response
+
+
+@pytest.fixture
+def cache():
+    fresh = ResponseCache()
+    with patch("app.utils.response_cache.response_cache", fresh):
+        yield fresh
+
+
+class TestCachedResponse:
+    @pytest.mark.asyncio
+    async def test_fresh_entry_skips_handler(self, cache):
+        calls = []
+
+        @cached_response(ttl=60)
+        async def endpoint(item_id: int):
+            calls.append(item_id)
+            return {"id": item_id}
+
+        first = await endpoint(item_id=1)
+        second = await endpoint(item_id=1)
+        await endpoint(item_id=2)
+
+        assert calls == [1, 2]
+        assert first.body == second.body == b'{"id":1}'
+
+    @pytest.mark.asyncio
+    async def test_serves_stale_on_upstream_error(self, cache):
+        fail = False
+
+        @cached_response(ttl=0)
+        async def endpoint(item_id: int):
+            if fail:
+                raise ConnectionError("upstream down")
+            return {"id": item_id}
+
+        await endpoint(item_id=1)
+        fail = True
+        stale = await endpoint(item_id=1)
+
+        assert stale.body == b'{"id":1}'
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_masked(self, cache):
+        missing = False
+
+        @cached_response(ttl=0)
+        async def endpoint(item_id: int):
+            if missing:
+                raise HTTPException(status_code=404, detail="gone")
+            return {"id": item_id}
+
+        await endpoint(item_id=1)
+        missing = True
+        with pytest.raises(HTTPException):
+            await endpoint(item_id=1)
+
+    @pytest.mark.asyncio
+    async def test_injected_dependencies_are_not_part_of_key(self, cache):
+        calls = []
+
+        @cached_response(ttl=60)
+        async def endpoint(item_id: int, db: object = None):
+            calls.append(item_id)
+            return {"id": item_id}
+
+        await endpoint(item_id=1, db=object())
+        await endpoint(item_id=1, db=object())
+
+        assert calls == [1]
+
+    @pytest.mark.asyncio
+    async def test_other_errors_are_not_masked(self, cache):
+        fail = False
+
+        @cached_response(ttl=0)
+        async def endpoint(item_id: int):
+            if fail:
+                raise ValueError("bug")
+            return {"id": item_id}
+
+        await endpoint(item_id=1)
+        fail = True
+        with pytest.raises(ValueError):
+            await endpoint(item_id=1)
+
+
+class TestResponseCache:
+    def test_invalidate_drops_entry(self):
+        cache = ResponseCache()
+        cache.set("k", b"{}", "application/json", ttl=60)
+        cache.invalidate("k")
+        assert cache.get("k") is None
+
+    def test_full_cache_evicts_oldest(self):
+        cache = ResponseCache(max_entries=2)
+        for key in ("a", "b", "c"):
+            cache.set(key, b"{}", "application/json", ttl=60)
+        assert cache.get("a") is None
+        assert cache.get("b") and cache.get("c")
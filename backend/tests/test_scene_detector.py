@@ -0,0 +1,74 @@
+"""Test the ffmpeg reader / frame analysis pipeline of the scene detector."""
+
+import asyncio
+import time
+
+import pytest
+
+from app.services import scene_detector
+
+FRAME_BYTES = scene_detector.FRAME_SIZE[0] * scene_detector.FRAME_SIZE[1] * 3
+
+
+def _frames(n: int) -> bytes:
+    """n raw frames, each filled with its own index."""
+    return b"".join(bytes([i]) * FRAME_BYTES for i in range(n))
+
+
+def _no_other_tasks() -> bool:
+    return asyncio.all_tasks() == {asyncio.current_task()}
+
+
+async def test_frames_are_analyzed_in_order(fake_ffmpeg, monkeypatch):
+    n = scene_detector.FRAME_QUEUE_SIZE * 3
+    processes = fake_ffmpeg(_frames(n))
+    seen = []
+
+    def fake_analyze(raw, w, h, prev_data):
+        seen.append(raw[0])
+        return None, {"is_detection": raw[0] == 5, "confidence": 0.9, "type": "scene_change"}
+
+    monkeypatch.setattr(scene_detector, "_analyze_frame", fake_analyze)
+
+    detections = await scene_detector._run_visual_pipeline("x.mkv", n * 2)
+
+    assert seen == list(range(n))
+    # Frame 5 at 0.5 fps is 10 seconds in
+    assert detections == [
+        {"timestamp_ticks": 10 * scene_detector.TICKS_PER_SECOND, "confidence": 0.9, "type": "scene_change"},
+    ]
+    assert processes[0].returncode == 0
+    assert _no_other_tasks()
+
+
+async def test_analysis_error_with_full_queue_shuts_down(fake_ffmpeg, monkeypatch):
+    processes = fake_ffmpeg(_frames(scene_detector.FRAME_QUEUE_SIZE * 3))
+
+    def failing_analyze(raw, w, h, prev_data):
+        # Give the reader time to fill the bounded queue
+        time.sleep(0.05)
+        raise RuntimeError("analysis failed")
+
+    monkeypatch.setattr(scene_detector, "_analyze_frame", failing_analyze)
+
+    with pytest.raises(RuntimeError, match="analysis failed"):
+        await asyncio.wait_for(scene_detector._run_visual_pipeline("x.mkv", 100), timeout=5)
+
+    assert processes[0].killed
+    assert _no_other_tasks()
+
+
+async def test_cancellation_reaches_caller(fake_ffmpeg, monkeypatch):
+    processes = fake_ffmpeg(_frames(50))
+
+    def slow_analyze(raw, w, h, prev_data):
+        time.sleep(0.01)
+        return None, None
+
+    monkeypatch.setattr(scene_detector, "_analyze_frame", slow_analyze)
+
+    with pytest.raises(TimeoutError):
+        await asyncio.wait_for(scene_detector._run_visual_pipeline("x.mkv", 100), timeout=0.05)
+
+    assert processes[0].killed
+    assert _no_other_tasks()
@@ -0,0 +1,79 @@
+"""Test lazy wrestler profile scraping."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from app.models.wrestler import Wrestler
+from app.routers import wrestlers
+from app.services.cagematch_scraper import WrestlerProfile
+
+
+class _SlowScraper:
+    def __init__(self):
+        self.calls = 0
+
+    async def scrape_wrestler_profile(self, cagematch_wrestler_id: int):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return WrestlerProfile(name="Bret Hart", image_url="http://img/bret.jpg")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_stale_loads_scrape_once(session_factory):
+    async with session_factory() as db:
+        db.add(Wrestler(cagematch_wrestler_id=123, name="Bret"))
+        await db.commit()
+
+    scraper = _SlowScraper()
+
+    async def load_page():
+        async with session_factory() as db:
+            wrestler = await wrestlers._find_wrestler(db, 123)
+            await wrestlers._maybe_scrape_profile(wrestler, db)
+            return wrestler.name
+
+    with patch.object(wrestlers, "get_scraper", return_value=scraper):
+        names = await asyncio.gather(load_page(), load_page(), load_page())
+
+    assert scraper.calls == 1
+    assert names == ["Bret Hart"] * 3
+    assert not wrestlers._scrape_locks
+    assert not wrestlers._scrape_lock_users
+
+
+@pytest.mark.asyncio
+async def test_wrestler_matches_include_all_participants(client, db, library):
+    from datetime import date
+
+    from app.models.event import Event
+    from app.models.match import Match, MatchParticipant
+
+    db.add(Event(id=1, cagematch_event_id=500, name="Big Show", date=date(2024, 5, 1), promotion_id=1))
+    db.add(Match(id=1, event_id=1, match_number=2, match_type="Singles", result="A defeats B"))
+    db.add_all([
+        Wrestler(id=1, cagematch_wrestler_id=10, name="A", last_scraped=None),
+        Wrestler(id=2, cagematch_wrestler_id=None, name="B", is_linked=False),
+    ])
+    await db.flush()
+    db.add_all([
+        MatchParticipant(match_id=1, wrestler_id=1, side=1, is_winner=True),
+        MatchParticipant(match_id=1, wrestler_id=2, side=2),
+    ])
+    await db.commit()
+
+    resp = await client.get("/api/v1/wrestlers/10/matches")
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["total"] == 1
+    match = data["matches"][0]
+    assert match["match_id"] == 1
+    assert match["is_winner"] is True
+    assert match["event"] == {
+        "id": 1, "cagematch_event_id": 500, "name": "Big Show", "date": "2024-05-01", "promotion_id": 1,
+    }
+    assert [(p["name"], p["side"], p["is_linked"]) for p in match["participants"]] == [
+        ("A", 1, True), ("B", 2, False),
+    ]
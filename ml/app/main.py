@@ -3,10 +3,14 @@
 from __future__ import annotations
 
 import asyncio
+import itertools
 import logging
 import os
 import sys
 import time
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
 
 import numpy as np
 import torch
@@ -27,10 +31,14 @@ app = FastAPI(title="Titantron ML", version="0.1.0")
 
 _model = None
 _model_loaded = False
+_class_index: ClassIndex | None = None
+# Forward passes run one at a time: concurrent requests share one model, and
+# parallel batches would multiply activation memory and fight over threads
+_inference_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference")
 
 SAMPLE_RATE = 32000  # PANNs expects 32kHz
 TICKS = 10_000_000
-AUDIO_EXTRACT_TIMEOUT = 300  # 5 min for ffmpeg extraction
+AUDIO_EXTRACT_TIMEOUT = 300  # 5 min without ffmpeg output aborts extraction
 
 # AudioSet music classes — used for continuous spectrum (no threshold filtering).
 MUSIC_CLASSES = {
@@ -62,27 +70,55 @@ BELL_CLASSES = {
 }
 
 DEFAULT_WINDOW_SECS = 30
+INFERENCE_BATCH_SECS = 120  # audio per forward pass; bounds CNN activation memory
+SILENCE_PEAK = 0.001  # ~-60 dBFS; windows that never exceed this skip inference
 
 
 DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
 
 
+class ClassIndex(NamedTuple):
+    """Model output columns for the classes we report, built once per model load."""
+
+    music: np.ndarray
+    bell: np.ndarray
+    bell_labels: list[str]
+    bell_thresholds: np.ndarray
+
+
+def _build_class_index(labels: list[str]) -> ClassIndex:
+    bell = [i for i, label in enumerate(labels) if label in BELL_CLASSES]
+    bell_labels = [labels[i] for i in bell]
+    return ClassIndex(
+        music=np.array([i for i, label in enumerate(labels) if label in MUSIC_CLASSES], dtype=np.intp),
+        bell=np.array(bell, dtype=np.intp),
+        bell_labels=bell_labels,
+        bell_thresholds=np.array([BELL_CLASSES[label] for label in bell_labels], dtype=np.float32),
+    )
+
+
 def _get_model():
     """Lazy-load PANNs AudioTagging model."""
-    global _model, _model_loaded
+    global _model, _model_loaded, _class_index
     if _model is None:
         logger.info(f"Loading PANNs CNN14 model on {DEVICE} (first request — may download ~327MB)...")
         t0 = time.time()
         from panns_inference import AudioTagging
 
         _model = AudioTagging(checkpoint_path=None, device=DEVICE)
+        _class_index = _build_class_index(_model.labels)
         _model_loaded = True
         logger.info(f"Model loaded in {time.time() - t0:.1f}s")
     return _model
 
 
-async def _extract_audio(file_path: str) -> bytes:
-    """Extract audio from video file as raw PCM float32 mono 32kHz."""
+async def _stream_audio(file_path: str, chunk_sizes: Iterator[int]) -> AsyncIterator[np.ndarray]:
+    """Extract audio from video file as raw PCM float32 mono 32kHz, in chunks.
+
+    Yields arrays sized by the next sample count from the endless
+    `chunk_sizes` iterator (the last may be shorter) as ffmpeg produces
+    them, so decoding overlaps with whatever the caller does between chunks.
+    """
     cmd = [
         "ffmpeg",
         "-i", file_path,
@@ -100,19 +136,57 @@ async def _extract_audio(file_path: str) -> bytes:
         stderr=asyncio.subprocess.PIPE,
     )
 
-    stdout, stderr = await asyncio.wait_for(
-        proc.communicate(),
-        timeout=AUDIO_EXTRACT_TIMEOUT,
-    )
+    # Drain stderr concurrently (keeping the tail for errors) so ffmpeg can't block on it
+    async def _drain_stderr() -> bytes:
+        tail = b""
+        while data := await proc.stderr.read(4096):
+            tail = (tail + data)[-500:]
+        return tail
+
+    stderr_task = asyncio.create_task(_drain_stderr())
+    total_bytes = 0
+
+    try:
+        for chunk_samples in chunk_sizes:
+            try:
+                data = await asyncio.wait_for(
+                    proc.stdout.readexactly(chunk_samples * 4),
+                    timeout=AUDIO_EXTRACT_TIMEOUT,
+                )
+            except asyncio.IncompleteReadError as e:
+                data = e.partial[: len(e.partial) // 4 * 4]
+                if data:
+                    total_bytes += len(data)
+                    yield np.frombuffer(data, dtype=np.float32)
+                break
+            total_bytes += len(data)
+            yield np.frombuffer(data, dtype=np.float32)
+        await proc.wait()
+    finally:
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        stderr = await stderr_task
 
     if proc.returncode != 0:
         err_msg = stderr.decode(errors="replace")[-500:]
         raise RuntimeError(f"ffmpeg audio extraction failed (exit {proc.returncode}): {err_msg}")
 
-    if len(stdout) < 4:
+    if total_bytes < 4:
         raise RuntimeError("ffmpeg produced no audio data")
 
-    return stdout
+
+def _ramped_batch_windows(max_windows: int) -> Iterator[int]:
+    """Windows per inference batch: 1, 2, 4, ... up to max_windows, then steady.
+
+    Small first batches start inference (and its overlap with decoding) as
+    soon as one window is decoded; full batches follow for throughput.
+    """
+    n = 1
+    while n < max_windows:
+        yield n
+        n *= 2
+    yield from itertools.repeat(max_windows)
 
 
 # ── Request models ──────────────────────────────────────────────────────────
@@ -135,7 +209,8 @@ async def health():
 async def classify(body: ClassifyRequest):
     """Classify music events from a video file.
 
-    Extracts audio via ffmpeg, then runs PANNs CNN14 inference.
+    Streams audio out of ffmpeg and runs PANNs CNN14 inference on each batch
+    of windows as it arrives, while the next batch is still being decoded.
     Returns JSON with spectrum (every window) + bell detections.
     """
     file_path = body.file_path
@@ -145,69 +220,89 @@ async def classify(body: ClassifyRequest):
     if not os.path.isfile(file_path):
         raise HTTPException(status_code=422, detail=f"File not found: {file_path}")
 
-    # Extract audio via ffmpeg
-    logger.info(f"Extracting audio from {file_path} (PCM float32 {SAMPLE_RATE}Hz mono)")
-    try:
-        pcm_data = await _extract_audio(file_path)
-    except Exception as e:
-        raise HTTPException(status_code=422, detail=f"Audio extraction failed: {e}")
-
-    audio = np.frombuffer(pcm_data, dtype=np.float32)
-    total_samples = len(audio)
-    total_secs = total_samples / SAMPLE_RATE
-
-    logger.info(f"Classifying {total_secs:.1f}s of audio ({len(pcm_data) / 1024 / 1024:.1f}MB, {window_secs}s windows)")
-
-    model = _get_model()
-
     window_samples = window_secs * SAMPLE_RATE
+    batch_windows = max(1, INFERENCE_BATCH_SECS // window_secs)
 
-    # Build label indices once
-    music_indices: list[int] = []
-    bell_indices: dict[int, tuple[str, float]] = {}
-    for i, label in enumerate(model.labels):
-        if label in MUSIC_CLASSES:
-            music_indices.append(i)
-        if label in BELL_CLASSES:
-            bell_indices[i] = (label, BELL_CLASSES[label])
-
+    model = None
     spectrum: list[dict] = []
     detections: list[dict] = []
-    offset = 0
-    window_count = 0
+    n_windows = 0
+    total_samples = 0
 
-    while offset < total_samples:
-        end = min(offset + window_samples, total_samples)
-        chunk = audio[offset:end]
+    # Extract audio via ffmpeg, classifying each batch of windows as it arrives
+    logger.info(f"Extracting audio from {file_path} (PCM float32 {SAMPLE_RATE}Hz mono, {window_secs}s windows)")
+    batches = _stream_audio(file_path, (n * window_samples for n in _ramped_batch_windows(batch_windows)))
+    next_batch = asyncio.ensure_future(anext(batches, None))
 
-        # Pad short final chunk
-        if len(chunk) < window_samples:
-            chunk = np.pad(chunk, (0, window_samples - len(chunk)))
-
-        # PANNs expects (batch, samples) shape
-        clipwise_output, _ = model.inference(chunk[np.newaxis, :])
-        probs = clipwise_output[0]  # shape: (527,)
-
-        window_start_secs = offset / SAMPLE_RATE
-
-        # Spectrum: max music probability across all music classes
-        max_music = float(max(probs[idx] for idx in music_indices)) if music_indices else 0.0
-        spectrum.append({"t": round(window_start_secs), "music": round(max_music, 3)})
-
-        # Bell detections: discrete events above threshold
-        for idx, (label, threshold) in bell_indices.items():
-            if probs[idx] > threshold:
+    try:
+        while True:
+            try:
+                batch = await next_batch
+            except Exception as e:
+                raise HTTPException(status_code=422, detail=f"Audio extraction failed: {e}")
+            if batch is None:
+                break
+
+            # Decode the next batch while this one is classified
+            next_batch = asyncio.ensure_future(anext(batches, None))
+
+            # Loaded once ffmpeg has produced audio, so bad input fails first
+            if model is None:
+                model = _get_model()
+                classes = _class_index
+
+            batch_start = n_windows
+            batch_end = batch_start + -(-len(batch) // window_samples)
+            n_windows = batch_end
+            total_samples += len(batch)
+
+            # Pad short final window
+            padded_len = (batch_end - batch_start) * window_samples
+            if len(batch) < padded_len:
+                batch = np.pad(batch, (0, padded_len - len(batch)))
+
+            # Silent windows can't contain music or a bell — score them as all-zero.
+            # Peak comes from max/min reductions, avoiding a batch-sized abs() copy
+            windows = batch.reshape(-1, window_samples)
+            active = np.maximum(windows.max(axis=1), -windows.min(axis=1)) >= SILENCE_PEAK
+            clipwise_output = np.zeros((len(windows), len(model.labels)), dtype=np.float32)
+
+            # PANNs expects (batch, samples) shape — one forward pass per batch,
+            # off the event loop so the next batch keeps streaming in
+            if active.any():
+                active_output, _ = await asyncio.get_running_loop().run_in_executor(
+                    _inference_executor, model.inference, windows[active]
+                )
+                clipwise_output[active] = active_output  # shape: (windows, 527)
+            window_ticks = [
+                int(w * window_samples / SAMPLE_RATE * TICKS) for w in range(batch_start, batch_end)
+            ]
+
+            # Spectrum: max music probability across all music classes
+            if len(classes.music):
+                max_music = clipwise_output[:, classes.music].max(axis=1).tolist()
+            else:
+                max_music = [0.0] * len(clipwise_output)
+            for w, music in enumerate(max_music, start=batch_start):
+                spectrum.append({"t": round(w * window_samples / SAMPLE_RATE), "music": round(music, 3)})
+
+            # Bell detections: discrete events above threshold, in window then label order
+            bell_probs = clipwise_output[:, classes.bell]
+            hit_rows, hit_cols = np.nonzero(bell_probs > classes.bell_thresholds)
+            for row, col, prob in zip(hit_rows.tolist(), hit_cols.tolist(), bell_probs[hit_rows, hit_cols].tolist()):
                 detections.append({
-                    "timestamp_ticks": int(window_start_secs * TICKS),
+                    "timestamp_ticks": window_ticks[row],
                     "type": "bell",
-                    "confidence": round(float(probs[idx]), 3),
-                    "label": label,
+                    "confidence": round(prob, 3),
+                    "label": classes.bell_labels[col],
                 })
+    finally:
+        if not next_batch.done():
+            next_batch.cancel()
+            await asyncio.wait([next_batch])
+        await batches.aclose()
 
-        offset += window_samples  # non-overlapping
-        window_count += 1
-
-    logger.info(f"Inference done: {window_count} windows, {len(detections)} bell detections")
+    logger.info(f"Inference done: {total_samples / SAMPLE_RATE:.1f}s of audio, {n_windows} windows, {len(detections)} bell detections")
 
     return {
         "spectrum": spectrum,